@@ -2,12 +2,21 @@
 API routes for geometry analysis (validation, mass properties).
 """
 
-from fastapi import APIRouter, HTTPException
-from app.core.ir import Part
-from app.core.builder import build_cad_model
-from app.core.geometry_utils import validate_geometry, calculate_mass_properties
+import asyncio
+
+import cadquery as cq
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from OCP.BRepExtrema import BRepExtrema_DistShapeShape
+from pydantic import BaseModel, ValidationError
+from app.core.ir import Part, PART_ADAPTER
+from app.core.builder import tessellation_to_arrays
+from app.core.build_cache import build_cad_model_cached, validate_geometry_cached
+from app.core.geometry_utils import calculate_mass_properties, exact_bounding_box
+from app.core.workers import run_cad_job
 from app.api.schemas import (
-    GeometryValidationRequest, GeometryValidationResponse, GeometryIssue,
+    GeometryValidationRequest, GeometryValidationResponse, MeshData,
     MassPropertiesRequest, MassPropertiesResponse, Material,
     ClearanceRequest, ClearanceResponse,
     InterferenceRequest, InterferenceResponse,
@@ -17,8 +26,22 @@ from app.api.schemas import (
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
 
-@router.post("/geometry-validation", response_model=GeometryValidationResponse)
-async def geometry_validation(request: GeometryValidationRequest):
+class _GeometryValidationPayload(BaseModel):
+    """GeometryValidationRequest with part_ir typed, so the body validates in one pass."""
+    part_ir: Part
+
+
+@router.post(
+    "/geometry-validation",
+    response_model=GeometryValidationResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": GeometryValidationRequest.model_json_schema()}}
+        }
+    }
+)
+async def geometry_validation(http_request: Request):
     """
     Deep geometry checks (independent of semantic checks).
     
@@ -31,36 +54,55 @@ async def geometry_validation(request: GeometryValidationRequest):
     
     Returns list of issues and whether the solid is valid.
     """
+    payload = await _parse_geometry_validation_body(http_request)
     try:
-        part = Part.model_validate(request.part_ir)
-        
-        # Build the CadQuery model
-        wp = build_cad_model(part)
-        solid = wp.val()
-        
-        # Validate geometry
-        is_valid, issues_list = validate_geometry(solid)
-        
-        # Convert issues to GeometryIssue models
-        geometry_issues = [
-            GeometryIssue(
-                code=issue["code"],
-                message=issue["message"],
-                severity=issue["severity"],
-                location=None  # Could be enhanced to include location info
-            )
-            for issue in issues_list
-        ]
-        
-        return GeometryValidationResponse(
-            issues=geometry_issues,
-            is_valid_solid=is_valid
-        )
+        return await run_cad_job(_geometry_validation, payload.part_ir)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Geometry validation failed: {str(e)}")
 
 
+async def _parse_geometry_validation_body(http_request: Request) -> _GeometryValidationPayload:
+    """
+    Parse the raw body straight into the IR models (no intermediate dict).
+    
+    Keeps the status codes of a regular GeometryValidationRequest body: a
+    non-JSON content type, malformed JSON or a missing/non-object part_ir
+    is a 422 request validation error; an invalid Part IR is a 400.
+    """
+    content_type = http_request.headers.get("content-type", "")
+    media_type = content_type.split(";")[0].strip().lower()
+    if content_type and media_type != "application/json" and not media_type.endswith("+json"):
+        raise RequestValidationError([{
+            "type": "model_attributes_type",
+            "loc": ("body",),
+            "msg": "Input should be a valid dictionary or object to extract fields from",
+            "input": None
+        }])
+    
+    try:
+        return _GeometryValidationPayload.model_validate_json(await http_request.body())
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        if all(len(error["loc"]) > 1 for error in errors):
+            # Errors inside part_ir: the IR itself is invalid
+            raise HTTPException(status_code=400, detail=f"Geometry validation failed: {str(e)}")
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in errors])
+
+
+def _geometry_validation(part: Part) -> GeometryValidationResponse:
+    """Build the part and validate its geometry (blocking; runs on a worker thread)."""
+    # Build and validate, reusing results for unchanged IR
+    is_valid, issues_list = validate_geometry_cached(part)
+    
+    # Validate the issue dicts in one pass rather than constructing each
+    # GeometryIssue in Python (location is left unset; could be enhanced)
+    return GeometryValidationResponse.model_validate({
+        "issues": issues_list,
+        "is_valid_solid": is_valid
+    })
+
+
 @router.post("/mass-properties", response_model=MassPropertiesResponse)
 async def mass_properties(request: MassPropertiesRequest):
     """
@@ -70,18 +112,14 @@ async def mass_properties(request: MassPropertiesRequest):
     - volume (m³)
     - area (m²)
     - center_of_mass [x, y, z] (m)
-    - principal_moments [Ixx, Iyy, Izz] (kg·m²)
-    - principal_axes (3x3 matrix)
+    - principal_moments [I1, I2, I3] (kg·m², ascending)
+    - principal_axes (3x3 matrix, one unit axis per row)
     
     Note: Density is accepted but not yet used for mass calculation in MVP.
     Volume and area are always returned.
     """
     try:
-        part = Part.model_validate(request.part_ir)
-        
-        # Build the CadQuery model
-        wp = build_cad_model(part)
-        solid = wp.val()
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
         # Determine density
         density = None
@@ -90,21 +128,30 @@ async def mass_properties(request: MassPropertiesRequest):
         elif request.material:
             density = request.material.density
         
-        # Calculate mass properties
-        props = calculate_mass_properties(solid, density=density)
-        
-        return MassPropertiesResponse(
-            volume=props["volume"],
-            area=props["area"],
-            center_of_mass=props["center_of_mass"],
-            principal_moments=props["principal_moments"],
-            principal_axes=props["principal_axes"]
-        )
+        return await run_cad_job(_mass_properties, part, density)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Mass properties calculation failed: {str(e)}")
 
 
+def _mass_properties(part: Part, density: float | None) -> MassPropertiesResponse:
+    """Build the part and compute its mass properties (blocking; runs on a worker thread)."""
+    # Build the CadQuery model
+    wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # Calculate mass properties
+    props = calculate_mass_properties(solid, density=density)
+    
+    return MassPropertiesResponse(
+        volume=props["volume"],
+        area=props["area"],
+        center_of_mass=props["center_of_mass"],
+        principal_moments=props["principal_moments"],
+        principal_axes=props["principal_axes"]
+    )
+
+
 @router.post("/clearance", response_model=ClearanceResponse)
 async def clearance(request: ClearanceRequest):
     """
@@ -113,59 +160,16 @@ async def clearance(request: ClearanceRequest):
     Returns minimum distance, locations, and any collisions.
     """
     try:
-        from app.core.ir import Part
-        from app.core.builder import build_cad_model
-        
-        part_a = Part.model_validate(request.part_a_ir)
-        part_b = Part.model_validate(request.part_b_ir)
-        
-        # Build both parts
-        wp_a = build_cad_model(part_a)
-        solid_a = wp_a.val()
+        part_a = PART_ADAPTER.validate_python(request.part_a_ir)
+        part_b = PART_ADAPTER.validate_python(request.part_b_ir)
         
-        wp_b = build_cad_model(part_b)
-        solid_b = wp_b.val()
+        # The two builds are independent, so run them concurrently
+        wp_a, wp_b = await asyncio.gather(
+            run_cad_job(build_cad_model_cached, part_a),
+            run_cad_job(build_cad_model_cached, part_b),
+        )
         
-        # Calculate minimum distance using OCC
-        try:
-            from OCP.BRepExtrema import BRepExtrema_DistShapeShape
-            
-            dist_calc = BRepExtrema_DistShapeShape(solid_a.wrapped, solid_b.wrapped)
-            dist_calc.Perform()
-            
-            if dist_calc.IsDone():
-                min_distance = dist_calc.Value() / 1000.0  # Convert mm to m
-                
-                # Get locations (simplified)
-                locations = []
-                if dist_calc.NbSolution() > 0:
-                    # Get point locations
-                    p1 = dist_calc.PointOnShape1(1)
-                    p2 = dist_calc.PointOnShape2(1)
-                    locations.append({
-                        "point_a": [p1.X() / 1000.0, p1.Y() / 1000.0, p1.Z() / 1000.0],
-                        "point_b": [p2.X() / 1000.0, p2.Y() / 1000.0, p2.Z() / 1000.0]
-                    })
-                
-                # Check for collisions
-                collisions = []
-                threshold = request.min_clearance_threshold or 0.0
-                if min_distance < threshold:
-                    collisions.append({
-                        "distance": min_distance,
-                        "location": locations[0] if locations else None
-                    })
-                
-                return ClearanceResponse(
-                    min_distance=min_distance,
-                    locations=locations,
-                    collisions=collisions
-                )
-            else:
-                raise HTTPException(status_code=400, detail="Distance calculation failed")
-                
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Clearance calculation failed: {str(e)}")
+        return await run_cad_job(_clearance, wp_a.val(), wp_b.val(), request.min_clearance_threshold)
             
     except HTTPException:
         raise
@@ -173,6 +177,48 @@ async def clearance(request: ClearanceRequest):
         raise HTTPException(status_code=400, detail=f"Clearance analysis failed: {str(e)}")
 
 
+def _clearance(solid_a: cq.Shape, solid_b: cq.Shape, min_clearance_threshold: float | None) -> ClearanceResponse:
+    """Measure the minimum distance between two built solids (blocking; runs on a worker thread)."""
+    # Calculate minimum distance using OCC
+    try:
+        dist_calc = BRepExtrema_DistShapeShape(solid_a.wrapped, solid_b.wrapped)
+        dist_calc.Perform()
+        
+        if dist_calc.IsDone():
+            min_distance = dist_calc.Value() / 1000.0  # Convert mm to m
+            
+            # Get locations (simplified)
+            locations = []
+            if dist_calc.NbSolution() > 0:
+                # Get point locations
+                p1 = dist_calc.PointOnShape1(1)
+                p2 = dist_calc.PointOnShape2(1)
+                locations.append({
+                    "point_a": [p1.X() / 1000.0, p1.Y() / 1000.0, p1.Z() / 1000.0],
+                    "point_b": [p2.X() / 1000.0, p2.Y() / 1000.0, p2.Z() / 1000.0]
+                })
+            
+            # Check for collisions
+            collisions = []
+            threshold = min_clearance_threshold or 0.0
+            if min_distance < threshold:
+                collisions.append({
+                    "distance": min_distance,
+                    "location": locations[0] if locations else None
+                })
+            
+            return ClearanceResponse(
+                min_distance=min_distance,
+                locations=locations,
+                collisions=collisions
+            )
+        else:
+            raise HTTPException(status_code=400, detail="Distance calculation failed")
+            
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Clearance calculation failed: {str(e)}")
+
+
 @router.post("/interference", response_model=InterferenceResponse)
 async def interference(request: InterferenceRequest):
     """
@@ -181,67 +227,81 @@ async def interference(request: InterferenceRequest):
     Returns whether interference exists and optionally intersection volume/mesh.
     """
     try:
-        from app.core.ir import Part
-        from app.core.builder import build_cad_model
-        
-        part_a = Part.model_validate(request.part_a_ir)
-        part_b = Part.model_validate(request.part_b_ir)
+        part_a = PART_ADAPTER.validate_python(request.part_a_ir)
+        part_b = PART_ADAPTER.validate_python(request.part_b_ir)
         
-        # Build both parts
-        wp_a = build_cad_model(part_a)
-        solid_a = wp_a.val()
+        # The two builds are independent, so run them concurrently
+        wp_a, wp_b = await asyncio.gather(
+            run_cad_job(build_cad_model_cached, part_a),
+            run_cad_job(build_cad_model_cached, part_b),
+        )
         
-        wp_b = build_cad_model(part_b)
-        solid_b = wp_b.val()
+        return await run_cad_job(_interference, wp_a.val(), wp_b.val())
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Interference analysis failed: {str(e)}")
+
+
+def _interference(solid_a: cq.Shape, solid_b: cq.Shape) -> InterferenceResponse:
+    """Intersect two built solids (blocking; runs on a worker thread)."""
+    # Disjoint bounding boxes rule out interference without running the boolean
+    if not _bounding_boxes_overlap(solid_a, solid_b):
+        return InterferenceResponse(
+            has_interference=False,
+            intersection_volume=None,
+            intersection_mesh=None
+        )
+    
+    # Check for intersection using boolean operation
+    try:
+        # Try intersection
+        intersection = solid_a.intersect(solid_b)
+        intersection_solid = intersection.val()
         
-        # Check for intersection using boolean operation
-        try:
-            # Try intersection
-            intersection = solid_a.intersect(solid_b)
-            intersection_solid = intersection.val()
+        if intersection_solid.Volume() > 1e-6:  # Significant volume
+            has_interference = True
+            intersection_volume = intersection_solid.Volume() / 1e9  # Convert mm³ to m³
+            
+            # Generate intersection mesh (optional), on a copy since its faces
+            # may be shared with the cached input solids
+            try:
+                vertices, faces = tessellation_to_arrays(intersection_solid.copy().tessellate(0.1))
+                intersection_mesh = MeshData.model_construct(vertices=vertices.tolist(), faces=faces.tolist())
+            except:
+                intersection_mesh = None
             
-            if intersection_solid.Volume() > 1e-6:  # Significant volume
-                has_interference = True
-                intersection_volume = intersection_solid.Volume() / 1e9  # Convert mm³ to m³
-                
-                # Generate intersection mesh (optional)
-                try:
-                    mesh_result = intersection_solid.tessellate(0.1)
-                    vertices = [[v.x, v.y, v.z] for v in mesh_result[0]]
-                    faces = []
-                    for tri in mesh_result[1]:
-                        if len(tri) >= 3:
-                            faces.append([tri[0], tri[1], tri[2]])
-                    
-                    from app.api.schemas import MeshData
-                    intersection_mesh = MeshData(vertices=vertices, faces=faces)
-                except:
-                    intersection_mesh = None
-                
-                return InterferenceResponse(
-                    has_interference=True,
-                    intersection_volume=intersection_volume,
-                    intersection_mesh=intersection_mesh
-                )
-            else:
-                return InterferenceResponse(
-                    has_interference=False,
-                    intersection_volume=None,
-                    intersection_mesh=None
-                )
-                
-        except Exception as e:
-            # Intersection failed - assume no interference
+            return InterferenceResponse(
+                has_interference=True,
+                intersection_volume=intersection_volume,
+                intersection_mesh=intersection_mesh
+            )
+        else:
             return InterferenceResponse(
                 has_interference=False,
                 intersection_volume=None,
                 intersection_mesh=None
             )
             
-    except HTTPException:
-        raise
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Interference analysis failed: {str(e)}")
+        # Intersection failed - assume no interference
+        return InterferenceResponse(
+            has_interference=False,
+            intersection_volume=None,
+            intersection_mesh=None
+        )
+
+
+def _bounding_boxes_overlap(solid_a: cq.Shape, solid_b: cq.Shape) -> bool:
+    """Whether the axis-aligned bounding boxes of two solids overlap."""
+    bb_a = exact_bounding_box(solid_a)
+    bb_b = exact_bounding_box(solid_b)
+    return not (
+        bb_a.xmax < bb_b.xmin or bb_b.xmax < bb_a.xmin or
+        bb_a.ymax < bb_b.ymin or bb_b.ymax < bb_a.ymin or
+        bb_a.zmax < bb_b.zmin or bb_b.zmax < bb_a.zmin
+    )
 
 
 @router.post("/tolerance-chain", response_model=ToleranceChainResponse)
@@ -253,39 +313,43 @@ async def tolerance_chain(request: ToleranceChainRequest):
     Geometry involvement is optional.
     """
     try:
-        from app.core.ir import Part
-        from app.core.builder import build_cad_model
-        
-        part = Part.model_validate(request.part_ir)
-        chain_def = request.chain_definition
-        
-        # Build the part
-        wp = build_cad_model(part)
-        solid = wp.val()
-        
-        # Extract chain information from definition
-        # This is a simplified implementation
-        # Full implementation would:
-        # 1. Extract surface/edge references from chain_def
-        # 2. Measure distances along the chain
-        # 3. Apply tolerances
-        # 4. Calculate worst-case min/max
-        
-        # For MVP: return placeholder values
-        # In full implementation, would calculate actual chain length from geometry
-        nominal_length = chain_def.get("nominal", 0.0)
-        tolerances = chain_def.get("tolerances", [])
-        
-        # Calculate worst-case
-        worst_case_min = nominal_length - sum(t.get("minus", 0) for t in tolerances)
-        worst_case_max = nominal_length + sum(t.get("plus", 0) for t in tolerances)
-        
-        return ToleranceChainResponse(
-            nominal_length=nominal_length,
-            worst_case_min=worst_case_min,
-            worst_case_max=worst_case_max,
-            monte_carlo_stats=None  # Optional
-        )
+        part = PART_ADAPTER.validate_python(request.part_ir)
+        return await run_cad_job(_tolerance_chain, part, request.chain_definition)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Tolerance chain analysis failed: {str(e)}")
+
+
+def _tolerance_chain(part: Part, chain_def: dict) -> ToleranceChainResponse:
+    """Build the part and evaluate the tolerance chain (blocking; runs on a worker thread)."""
+    # Build the part
+    wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # Extract chain information from definition
+    # This is a simplified implementation
+    # Full implementation would:
+    # 1. Extract surface/edge references from chain_def
+    # 2. Measure distances along the chain
+    # 3. Apply tolerances
+    # 4. Calculate worst-case min/max
+    
+    # For MVP: return placeholder values
+    # In full implementation, would calculate actual chain length from geometry
+    nominal_length = chain_def.get("nominal", 0.0)
+    tolerances = chain_def.get("tolerances", [])
+    
+    # Calculate worst-case: one (minus, plus) row per contributor
+    bounds = np.array(
+        [(t.get("minus", 0.0), t.get("plus", 0.0)) for t in tolerances], dtype=np.float64
+    ).reshape(-1, 2)
+    minus_total, plus_total = bounds.sum(axis=0).tolist()
+    worst_case_min = nominal_length - minus_total
+    worst_case_max = nominal_length + plus_total
+    
+    return ToleranceChainResponse(
+        nominal_length=nominal_length,
+        worst_case_min=worst_case_min,
+        worst_case_max=worst_case_max,
+        monte_carlo_stats=None  # Optional
+    )
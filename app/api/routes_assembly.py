@@ -2,9 +2,12 @@
 API routes for assembly operations.
 """
 
+import cadquery as cq
 from fastapi import APIRouter, HTTPException
-from app.core.ir import Part
-from app.core.builder import build_cad_model
+from app.core.ir import Part, PART_ADAPTER
+from app.core.builder import tessellation_to_arrays
+from app.core.build_cache import build_cad_model_cached
+from app.core.workers import run_cad_job
 from app.api.schemas import (
     AssemblyBuildRequest, AssemblyBuildResponse, MateDefinition, MeshData,
     AssemblyInterferenceRequest, AssemblyInterferenceResponse,
@@ -23,36 +26,9 @@ async def assembly_build(request: AssemblyBuildRequest):
     """
     try:
         # Parse all parts
-        parts = [Part.model_validate(p) for p in request.parts]
+        parts = [PART_ADAPTER.validate_python(p) for p in request.parts]
         
-        # Build each part
-        solids = []
-        for part in parts:
-            wp = build_cad_model(part)
-            solids.append(wp.val())
-        
-        # Apply mates (simplified - full implementation would transform parts)
-        # For MVP: just combine all solids
-        import cadquery as cq
-        
-        combined_wp = cq.Workplane("XY")
-        for solid in solids:
-            combined_wp = combined_wp.union(cq.Workplane("XY").newObject([solid]))
-        
-        combined_solid = combined_wp.val()
-        
-        # Generate mesh
-        try:
-            mesh_result = combined_solid.tessellate(0.1)
-            vertices = [[v.x, v.y, v.z] for v in mesh_result[0]]
-            faces = []
-            for tri in mesh_result[1]:
-                if len(tri) >= 3:
-                    faces.append([tri[0], tri[1], tri[2]])
-            
-            mesh = MeshData(vertices=vertices, faces=faces)
-        except:
-            mesh = None
+        mesh = await run_cad_job(_assembly_mesh, parts)
         
         # Mate status (simplified)
         mate_status = {
@@ -71,6 +47,36 @@ async def assembly_build(request: AssemblyBuildRequest):
         raise HTTPException(status_code=400, detail=f"Assembly build failed: {str(e)}")
 
 
+def _assembly_mesh(parts: list[Part]) -> MeshData | None:
+    """Build the parts, combine them and mesh the result (blocking; runs on a worker thread)."""
+    # Build each part
+    solids = []
+    for part in parts:
+        wp = build_cad_model_cached(part)
+        solids.append(wp.val())
+    
+    # Apply mates (simplified - full implementation would transform parts)
+    # For MVP: just combine all solids
+    combined_wp = cq.Workplane("XY")
+    for solid in solids:
+        combined_wp = combined_wp.union(cq.Workplane("XY").newObject([solid]))
+    
+    combined_solid = combined_wp.val()
+    
+    # Generate mesh. The combined solid is (or shares faces with) cached,
+    # shared solids and tessellation writes onto the shape: mesh a copy
+    try:
+        vertices_arr, faces_arr = tessellation_to_arrays(combined_solid.copy().tessellate(0.1))
+        vertices = vertices_arr.tolist()
+        faces = faces_arr.tolist()
+        
+        mesh = MeshData(vertices=vertices, faces=faces)
+    except:
+        mesh = None
+    
+    return mesh
+
+
 @router.post("/interference-check", response_model=AssemblyInterferenceResponse)
 async def assembly_interference_check(request: AssemblyInterferenceRequest):
     """
@@ -83,44 +89,9 @@ async def assembly_interference_check(request: AssemblyInterferenceRequest):
         
         # Extract parts from assembly
         parts_list = assembly_ir.get("parts", [])
-        parts = [Part.model_validate(p) for p in parts_list]
-        
-        # Build all parts
-        solids = []
-        for part in parts:
-            wp = build_cad_model(part)
-            solids.append(wp.val())
+        parts = [PART_ADAPTER.validate_python(p) for p in parts_list]
         
-        # Check all pairs for interference
-        colliding_pairs = []
-        collision_volumes = []
-        
-        for i, solid_a in enumerate(solids):
-            for j, solid_b in enumerate(solids[i+1:], start=i+1):
-                try:
-                    intersection = solid_a.intersect(solid_b)
-                    intersection_solid = intersection.val()
-                    
-                    if intersection_solid.Volume() > 1e-6:
-                        colliding_pairs.append({
-                            "part_a": i,
-                            "part_b": j,
-                            "volume": intersection_solid.Volume() / 1e9  # Convert to m³
-                        })
-                        
-                        # Generate collision mesh
-                        try:
-                            mesh_result = intersection_solid.tessellate(0.1)
-                            vertices = [[v.x, v.y, v.z] for v in mesh_result[0]]
-                            faces = []
-                            for tri in mesh_result[1]:
-                                if len(tri) >= 3:
-                                    faces.append([tri[0], tri[1], tri[2]])
-                            collision_volumes.append(MeshData(vertices=vertices, faces=faces))
-                        except:
-                            pass
-                except:
-                    pass
+        colliding_pairs, collision_volumes = await run_cad_job(_assembly_interference, parts)
         
         return AssemblyInterferenceResponse(
             colliding_pairs=colliding_pairs,
@@ -132,6 +103,47 @@ async def assembly_interference_check(request: AssemblyInterferenceRequest):
         raise HTTPException(status_code=400, detail=f"Assembly interference check failed: {str(e)}")
 
 
+def _assembly_interference(parts: list[Part]) -> tuple[list[dict], list[MeshData]]:
+    """Build the parts and intersect every pair (blocking; runs on a worker thread)."""
+    # Build all parts
+    solids = []
+    for part in parts:
+        wp = build_cad_model_cached(part)
+        solids.append(wp.val())
+    
+    # Check all pairs for interference
+    colliding_pairs = []
+    collision_volumes = []
+    
+    for i, solid_a in enumerate(solids):
+        for j, solid_b in enumerate(solids[i+1:], start=i+1):
+            try:
+                intersection = solid_a.intersect(solid_b)
+                intersection_solid = intersection.val()
+                
+                if intersection_solid.Volume() > 1e-6:
+                    colliding_pairs.append({
+                        "part_a": i,
+                        "part_b": j,
+                        "volume": intersection_solid.Volume() / 1e9  # Convert to m³
+                    })
+                    
+                    # Generate collision mesh on a copy (faces may be shared with cached solids)
+                    try:
+                        vertices_arr, faces_arr = tessellation_to_arrays(
+                            intersection_solid.copy().tessellate(0.1)
+                        )
+                        vertices = vertices_arr.tolist()
+                        faces = faces_arr.tolist()
+                        collision_volumes.append(MeshData(vertices=vertices, faces=faces))
+                    except:
+                        pass
+            except:
+                pass
+    
+    return colliding_pairs, collision_volumes
+
+
 @router.post("/motion-sweep", response_model=MotionSweepResponse)
 async def motion_sweep(request: MotionSweepRequest):
     """
@@ -2,10 +2,15 @@
 API routes for building geometry from IR (solids and sketches).
 """
 
-from fastapi import APIRouter, HTTPException
-from app.core.ir import Part, Sketch
-from app.core.builder import build_cad_model, generate_mesh
-from app.core.geometry_utils import calculate_bounding_box, get_topology_summary
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request, Response
+from app.core.ir import Part, Feature, Sketch, PART_ADAPTER
+from app.core.builder import generate_mesh, tessellation_to_arrays
+from app.core.build_cache import build_cad_model_cached, build_cad_model_up_to_feature_cached
+from app.core.geometry_utils import calculate_bounding_box, get_topology_summary, tessellate_cached
+from app.core.mesh_utils import cluster_vertices, optimize_vertex_fetch
+from app.core.etag import request_etag, not_modified
+from app.core.workers import run_cad_job
 from app.api.schemas import (
     BuildSolidRequest, BuildSolidResponse, BoundingBox, TopologySummary, MeshData,
     BuildSketchRequest, BuildSketchResponse, Curve2D, ConstraintStatus,
@@ -16,86 +21,113 @@ router = APIRouter(prefix="/build", tags=["build"])
 
 
 @router.post("/solid", response_model=BuildSolidResponse)
-async def build_solid(request: BuildSolidRequest):
+async def build_solid(request: BuildSolidRequest, http_request: Request, response: Response):
     """
     Build a full solid for a single part from IR.
     
     Input:
     - part_ir: Part IR as JSON
-    - detail_level: "coarse" | "normal" | "high" (affects tessellation)
+    - detail_level: "coarse" | "normal" | "high" (affects tessellation),
+      or "multi" for a high-detail mesh plus coarser LODs from one tessellation
     - return_mesh: bool (whether to return mesh data)
     
     Output:
     - mesh: Mesh data (if return_mesh=True)
+    - lods: Coarser meshes by detail level (if detail_level="multi")
     - bounding_box: 3D bounding box
     - topology_summary: Face/edge/vertex counts
     - status: Build status
     - warnings: List of warnings
+    
+    Responses carry an ETag; resending it in If-None-Match returns 304.
     """
     try:
         # Parse Part IR
-        part = Part.model_validate(request.part_ir)
-        
-        # Build CadQuery model
-        wp = build_cad_model(part)
-        solid = wp.val()
-        
-        # Calculate bounding box
-        bbox_dict = calculate_bounding_box(solid)
-        bbox = BoundingBox(min=bbox_dict["min"], max=bbox_dict["max"])
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
-        # Get topology summary
-        topo_dict = get_topology_summary(solid)
-        topology = TopologySummary(
-            face_count=topo_dict["face_count"],
-            edge_count=topo_dict["edge_count"],
-            vertex_count=topo_dict["vertex_count"]
-        )
-        
-        # Generate mesh if requested
-        mesh_data = None
-        if request.return_mesh:
-            # Map detail_level to tessellation tolerance
-            tolerance_map = {
-                "coarse": 0.5,
-                "normal": 0.1,
-                "high": 0.01
-            }
-            tolerance = tolerance_map.get(request.detail_level, 0.1)
-            
-            try:
-                mesh_result = solid.tessellate(tolerance)
-                vertices = [[v.x, v.y, v.z] for v in mesh_result[0]]
-                faces = []
-                
-                for tri in mesh_result[1]:
-                    if len(tri) >= 3:
-                        faces.append([tri[0], tri[1], tri[2]])
-                
-                mesh_data = MeshData(vertices=vertices, faces=faces)
-            except Exception as e:
-                # Mesh generation failed, but we can still return other data
-                warnings = [f"Mesh generation failed: {str(e)}"]
-                return BuildSolidResponse(
-                    mesh=None,
-                    bounding_box=bbox,
-                    topology_summary=topology,
-                    status="partial",
-                    warnings=warnings
-                )
+        etag = request_etag(http_request, request, part)
+        cached = not_modified(http_request, etag)
+        if cached is not None:
+            return cached
+        response.headers["ETag"] = etag
         
-        return BuildSolidResponse(
-            mesh=mesh_data,
-            bounding_box=bbox,
-            topology_summary=topology,
-            status="ok",
-            warnings=[]
-        )
+        return await run_cad_job(_build_solid, part, request.detail_level, request.return_mesh)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Build failed: {str(e)}")
 
 
+def _build_solid(part: Part, detail_level: str, return_mesh: bool) -> BuildSolidResponse:
+    """Build the part and summarize/mesh it (blocking; runs on a worker thread)."""
+    # Build CadQuery model
+    wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # Calculate bounding box
+    bbox_dict = calculate_bounding_box(solid)
+    bbox = BoundingBox(min=bbox_dict["min"], max=bbox_dict["max"])
+    
+    # Get topology summary
+    topo_dict = get_topology_summary(solid)
+    topology = TopologySummary(
+        face_count=topo_dict["face_count"],
+        edge_count=topo_dict["edge_count"],
+        vertex_count=topo_dict["vertex_count"]
+    )
+    
+    # Generate mesh if requested
+    mesh_data = None
+    lods = None
+    if return_mesh:
+        # Map detail_level to tessellation tolerance
+        tolerance_map = {
+            "coarse": 0.5,
+            "normal": 0.1,
+            "high": 0.01
+        }
+        # "multi" tessellates once at high detail and simplifies from there;
+        # tessellate_cached remeshes per tolerance, so later normal/coarse
+        # meshes of the cached solid do not inherit this fine triangulation
+        tolerance = tolerance_map.get("high" if detail_level == "multi" else detail_level, 0.1)
+        
+        try:
+            vertices_arr, faces_arr = tessellation_to_arrays(tessellate_cached(solid, tolerance))
+            vertices = vertices_arr.tolist()
+            faces = faces_arr.tolist()
+            
+            # Arrays come straight from the tessellator: skip per-element validation
+            mesh_data = MeshData.model_construct(vertices=vertices, faces=faces)
+            
+            if detail_level == "multi":
+                lods = {}
+                for level in ("normal", "coarse"):
+                    lod_vertices, lod_faces = optimize_vertex_fetch(
+                        *cluster_vertices(vertices_arr, faces_arr, tolerance_map[level])
+                    )
+                    lods[level] = MeshData.model_construct(
+                        vertices=lod_vertices.tolist(), faces=lod_faces.tolist()
+                    )
+        except Exception as e:
+            # Mesh generation failed, but we can still return other data
+            warnings = [f"Mesh generation failed: {str(e)}"]
+            return BuildSolidResponse(
+                mesh=None,
+                bounding_box=bbox,
+                topology_summary=topology,
+                status="partial",
+                warnings=warnings
+            )
+    
+    return BuildSolidResponse(
+        mesh=mesh_data,
+        lods=lods,
+        bounding_box=bbox,
+        topology_summary=topology,
+        status="ok",
+        warnings=[]
+    )
+
+
 @router.post("/sketch", response_model=BuildSketchResponse)
 async def build_sketch(request: BuildSketchRequest):
     """
@@ -115,35 +147,44 @@ async def build_sketch(request: BuildSketchRequest):
         # Parse Sketch IR
         sketch = Sketch.model_validate(request.sketch_ir)
         
-        # Convert entities to 2D curves
+        # Convert entities to 2D curves, collecting lines and circles for the issue checks
+        # and rectangles for batched corner expansion
         curves = []
-        for entity in sketch.entities:
+        line_indices, line_coords = [], []
+        circle_indices, circle_radii = [], []
+        rect_slots, rect_coords = [], []
+        for index, entity in enumerate(sketch.entities):
             if entity.type == "line" and entity.start and entity.end:
+                line_indices.append(index)
+                line_coords.append((*entity.start, *entity.end))
                 curves.append(Curve2D(
                     type="line",
                     points=[list(entity.start), list(entity.end)]
                 ))
-            elif entity.type == "circle" and entity.center and entity.radius:
-                curves.append(Curve2D(
-                    type="circle",
-                    points=[],
-                    radius=entity.radius,
-                    center=list(entity.center)
-                ))
+            elif entity.type == "circle" and entity.radius:
+                circle_indices.append(index)
+                circle_radii.append(entity.radius)
+                if entity.center:
+                    curves.append(Curve2D(
+                        type="circle",
+                        points=[],
+                        radius=entity.radius,
+                        center=list(entity.center)
+                    ))
             elif entity.type == "rectangle" and entity.corner1 and entity.corner2:
-                # Convert rectangle to 4 points
-                c1 = entity.corner1
-                c2 = entity.corner2
-                points = [
-                    [c1[0], c1[1]],
-                    [c2[0], c1[1]],
-                    [c2[0], c2[1]],
-                    [c1[0], c2[1]]
-                ]
-                curves.append(Curve2D(
-                    type="rectangle",
-                    points=points
-                ))
+                # Filled in below once all rectangles are known
+                rect_slots.append(len(curves))
+                rect_coords.append((*entity.corner1[:2], *entity.corner2[:2]))
+                curves.append(None)
+        
+        if rect_coords:
+            # Convert each rectangle (x1, y1, x2, y2) to its 4 corners
+            rects = np.array(rect_coords, dtype=np.float64)
+            corners = np.stack([
+                rects[:, [0, 1]], rects[:, [2, 1]], rects[:, [2, 3]], rects[:, [0, 3]]
+            ], axis=1)
+            for slot, points in zip(rect_slots, corners.tolist()):
+                curves[slot] = Curve2D(type="rectangle", points=points)
         
         # Basic constraint validation (MVP: simplified)
         # Count constraints and entities to estimate DOF
@@ -164,27 +205,31 @@ async def build_sketch(request: BuildSketchRequest):
             degrees_of_freedom=estimated_dof if estimated_dof > 0 else None
         )
         
-        # Check for issues
-        issues = []
-        for entity in sketch.entities:
-            if entity.type == "line" and entity.start and entity.end:
-                # Check for zero-length lines
-                dx = entity.end[0] - entity.start[0]
-                dy = entity.end[1] - entity.start[1]
-                length = (dx**2 + dy**2)**0.5
-                if length < 1e-6:
-                    issues.append({
-                        "code": "ZERO_LENGTH_SEGMENT",
-                        "message": f"Line entity {entity.id} has zero length",
-                        "severity": "warning"
-                    })
-            elif entity.type == "circle" and entity.radius:
-                if entity.radius <= 0:
-                    issues.append({
-                        "code": "INVALID_CIRCLE",
-                        "message": f"Circle entity {entity.id} has non-positive radius",
-                        "severity": "error"
-                    })
+        # Check for issues: scan all lines/circles at once, then emit issues for
+        # the (few) flagged entities in entity order
+        flagged = []
+        if line_coords:
+            # Check for zero-length lines
+            coords = np.array(line_coords, dtype=np.float64)
+            lengths = np.hypot(coords[:, 2] - coords[:, 0], coords[:, 3] - coords[:, 1])
+            for k in np.flatnonzero(lengths < 1e-6).tolist():
+                entity = sketch.entities[line_indices[k]]
+                flagged.append((line_indices[k], {
+                    "code": "ZERO_LENGTH_SEGMENT",
+                    "message": f"Line entity {entity.id} has zero length",
+                    "severity": "warning"
+                }))
+        if circle_radii:
+            radii = np.array(circle_radii, dtype=np.float64)
+            for k in np.flatnonzero(radii <= 0).tolist():
+                entity = sketch.entities[circle_indices[k]]
+                flagged.append((circle_indices[k], {
+                    "code": "INVALID_CIRCLE",
+                    "message": f"Circle entity {entity.id} has non-positive radius",
+                    "severity": "error"
+                }))
+        flagged.sort(key=lambda item: item[0])
+        issues = [issue for _, issue in flagged]
         
         return BuildSketchResponse(
             curves=curves,
@@ -204,7 +249,7 @@ async def build_feature(request: BuildFeatureRequest):
     Used for preview, highlighting, and feature-level tools.
     """
     try:
-        part = Part.model_validate(request.part_ir)
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
         # Find the feature
         feature = None
@@ -216,47 +261,48 @@ async def build_feature(request: BuildFeatureRequest):
         if not feature:
             raise HTTPException(status_code=404, detail=f"Feature '{request.feature_id}' not found")
         
-        # For MVP: build up to this feature
-        # In a full implementation, we'd build incrementally
-        # For now, we build the full model and extract feature-specific geometry
-        wp = build_cad_model(part)
-        solid = wp.val()
-        
-        # Generate mesh
-        try:
-            mesh_result = solid.tessellate(0.1)
-            vertices = [[v.x, v.y, v.z] for v in mesh_result[0]]
-            faces = []
-            
-            for tri in mesh_result[1]:
-                if len(tri) >= 3:
-                    faces.append([tri[0], tri[1], tri[2]])
-            
-            mesh_data = MeshData(vertices=vertices, faces=faces, featureId=feature.name)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Mesh generation failed: {str(e)}")
-        
-        # Calculate bounding box
-        from app.core.geometry_utils import calculate_bounding_box
-        bbox_dict = calculate_bounding_box(solid)
-        bbox = BoundingBox(min=bbox_dict["min"], max=bbox_dict["max"])
-        
-        # Find dependencies (features that come before this one)
-        depends_on = []
-        for f in part.features:
-            if f.name == feature.name:
-                break
-            depends_on.append(f.name)
-        
-        return BuildFeatureResponse(
-            mesh=mesh_data,
-            bounding_box=bbox,
-            affected_region=None,  # Could be enhanced
-            depends_on_features=depends_on
-        )
+        return await run_cad_job(_build_feature, part, feature)
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Feature build failed: {str(e)}")
 
+
+def _build_feature(part: Part, feature: Feature) -> BuildFeatureResponse:
+    """Build the part up to a feature and mesh it (blocking; runs on a worker thread)."""
+    # Build up to this feature, resuming from cached earlier features
+    wp = build_cad_model_up_to_feature_cached(part, feature.name)
+    if not wp.objects:
+        # No solid yet (e.g. a sketch before any extrude): show the full model
+        wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # Generate mesh
+    try:
+        vertices_arr, faces_arr = tessellation_to_arrays(tessellate_cached(solid, 0.1))
+        vertices = vertices_arr.tolist()
+        faces = faces_arr.tolist()
+        
+        # Arrays come straight from the tessellator: skip per-element validation
+        mesh_data = MeshData.model_construct(vertices=vertices, faces=faces, featureId=feature.name)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Mesh generation failed: {str(e)}")
+    
+    # Calculate bounding box
+    bbox_dict = calculate_bounding_box(solid)
+    bbox = BoundingBox(min=bbox_dict["min"], max=bbox_dict["max"])
+    
+    # Find dependencies (features that come before this one)
+    depends_on = []
+    for f in part.features:
+        if f.name == feature.name:
+            break
+        depends_on.append(f.name)
+    
+    return BuildFeatureResponse(
+        mesh=mesh_data,
+        bounding_box=bbox,
+        affected_region=None,  # Could be enhanced
+        depends_on_features=depends_on
+    )
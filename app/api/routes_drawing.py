@@ -3,8 +3,9 @@ API routes for drafting and drawing generation.
 """
 
 from fastapi import APIRouter, HTTPException
-from app.core.ir import Part
-from app.core.builder import build_cad_model
+from app.core.ir import PART_ADAPTER
+from app.core.build_cache import build_cad_model_cached
+from app.core.workers import run_cad_job
 from app.core.drawing import generate_front_view_svg
 from app.api.schemas import (
     GenerateViewsRequest, GenerateViewsResponse, DrawingView, DrawingEdge, ViewSpec,
@@ -23,10 +24,10 @@ async def generate_views(request: GenerateViewsRequest):
     Creates front/top/right/isometric views with edge visibility.
     """
     try:
-        part = Part.model_validate(request.part_ir)
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
-        # Build the CadQuery model
-        wp = build_cad_model(part)
+        # Build the CadQuery model (on a worker thread)
+        wp = await run_cad_job(build_cad_model_cached, part)
         solid = wp.val()
         
         views = []
@@ -76,7 +77,7 @@ async def dimension_layout(request: DimensionLayoutRequest):
     Uses part parameters to create dimension entities with automatic layout.
     """
     try:
-        part = Part.model_validate(request.part_ir)
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
         # Extract dimensions from part parameters and sketch dimensions
         dimensions = []
@@ -125,7 +126,7 @@ async def render_svg(request: RenderSvgRequest):
         if request.drawing_ir:
             # Use drawing IR
             # For MVP, use existing SVG generation
-            part = Part.model_validate(request.drawing_ir.get("part", {}))
+            part = PART_ADAPTER.validate_python(request.drawing_ir.get("part", {}))
             svg_content = generate_front_view_svg(part)
             return RenderSvgResponse(svg=svg_content)
         elif request.views:
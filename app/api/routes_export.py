@@ -7,8 +7,10 @@ import base64
 import tempfile
 import os
 import cadquery as cq
-from app.core.ir import Part
-from app.core.builder import build_cad_model
+from typing import Any, Callable
+from app.core.ir import Part, PART_ADAPTER
+from app.core.build_cache import build_cad_model_cached
+from app.core.workers import run_cad_job
 from app.api.schemas import (
     ExportStepRequest, ExportStepResponse,
     ExportStlRequest, ExportStlResponse, MeshParams,
@@ -18,6 +20,27 @@ from app.api.schemas import (
 router = APIRouter(prefix="/export", tags=["export"])
 
 
+def _export_to_bytes(write: Callable[[str], Any], suffix: str) -> bytes:
+    """
+    Run a path-based exporter and return the written file's contents.
+    
+    OCC's STEP/STL writers only accept a file path, so the export goes
+    through a private temporary directory that is removed afterwards.
+    
+    Args:
+        write: Function writing the export to the given path
+        suffix: File extension (e.g. ".step")
+        
+    Returns:
+        Exported file bytes
+    """
+    with tempfile.TemporaryDirectory() as export_dir:
+        path = os.path.join(export_dir, f"export{suffix}")
+        write(path)
+        with open(path, "rb") as f:
+            return f.read()
+
+
 @router.post("/step", response_model=ExportStepResponse)
 async def export_step(request: ExportStepRequest):
     """
@@ -26,31 +49,10 @@ async def export_step(request: ExportStepRequest):
     Returns base64-encoded STEP file.
     """
     try:
-        part = Part.model_validate(request.part_ir)
+        part = PART_ADAPTER.validate_python(request.part_ir)
         part_name = request.name or part.name
         
-        # Build the CadQuery model
-        wp = build_cad_model(part)
-        solid = wp.val()
-        
-        # Export to STEP using CadQuery's export method
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.step', delete=False) as tmp:
-            tmp_path = tmp.name
-        
-        try:
-            # CadQuery exportStep writes to a file
-            # Try to use schema parameter if available
-            try:
-                solid.exportStep(tmp_path, schema=request.step_schema)
-            except TypeError:
-                # Fallback if schema parameter not supported
-                solid.exportStep(tmp_path)
-            
-            with open(tmp_path, 'rb') as f:
-                step_data = f.read()
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        step_data = await run_cad_job(_export_step, part, request.step_schema)
         
         # Encode to base64
         file_b64 = base64.b64encode(step_data).decode('utf-8')
@@ -64,6 +66,24 @@ async def export_step(request: ExportStepRequest):
         raise HTTPException(status_code=400, detail=f"STEP export failed: {str(e)}")
 
 
+def _export_step(part: Part, step_schema: str) -> bytes:
+    """Build the part and write it as STEP (blocking; runs on a worker thread)."""
+    # Build the CadQuery model
+    wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # Export to STEP using CadQuery's export method
+    def write_step(path: str) -> None:
+        # Try to use schema parameter if available
+        try:
+            solid.exportStep(path, schema=step_schema)
+        except TypeError:
+            # Fallback if schema parameter not supported
+            solid.exportStep(path)
+    
+    return _export_to_bytes(write_step, ".step")
+
+
 @router.post("/stl", response_model=ExportStlResponse)
 async def export_stl(request: ExportStlRequest):
     """
@@ -72,34 +92,9 @@ async def export_stl(request: ExportStlRequest):
     Returns base64-encoded STL file.
     """
     try:
-        part = Part.model_validate(request.part_ir)
-        
-        # Build the CadQuery model
-        wp = build_cad_model(part)
-        solid = wp.val()
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
-        # Apply mesh parameters if provided
-        # For MVP, we use tessellation tolerance
-        tolerance = 0.1  # default
-        if request.mesh_params:
-            if request.mesh_params.linear_tolerance:
-                tolerance = request.mesh_params.linear_tolerance
-        
-        # Export to STL using CadQuery's export method
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.stl', delete=False) as tmp:
-            tmp_path = tmp.name
-        
-        try:
-            # CadQuery exportStl writes to a file
-            # Note: mesh_params would ideally control tessellation, but CadQuery's exportStl
-            # uses its own internal tessellation. For MVP, we accept this limitation.
-            solid.exportStl(tmp_path)
-            
-            with open(tmp_path, 'rb') as f:
-                stl_data = f.read()
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        stl_data = await run_cad_job(_export_stl, part, request.mesh_params)
         
         # Encode to base64
         file_b64 = base64.b64encode(stl_data).decode('utf-8')
@@ -112,6 +107,27 @@ async def export_stl(request: ExportStlRequest):
         raise HTTPException(status_code=400, detail=f"STL export failed: {str(e)}")
 
 
+def _export_stl(part: Part, mesh_params: MeshParams | None) -> bytes:
+    """Build the part and write it as STL (blocking; runs on a worker thread)."""
+    # Build the CadQuery model
+    wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # Apply mesh parameters if provided
+    # For MVP, we use tessellation tolerance
+    tolerance = 0.1  # default
+    if mesh_params:
+        if mesh_params.linear_tolerance:
+            tolerance = mesh_params.linear_tolerance
+    
+    # Export to STL using CadQuery's export method
+    # Note: mesh_params would ideally control tessellation, but CadQuery's exportStl
+    # uses its own internal tessellation. For MVP, we accept this limitation.
+    # STL export meshes in place: export a copy so the cached, shared solid
+    # keeps no triangulation from it
+    return _export_to_bytes(solid.copy().exportStl, ".stl")
+
+
 @router.post("/dxf", response_model=ExportDxfResponse)
 async def export_dxf(request: ExportDxfRequest):
     """
@@ -120,16 +136,12 @@ async def export_dxf(request: ExportDxfRequest):
     Can export from part IR with view spec, or from drawing IR.
     """
     try:
-        import base64
-        import tempfile
-        import os
-        
         # For MVP: simplified DXF export
         # Full implementation would use a DXF library (e.g., ezdxf)
         # For now, return a placeholder
         
         if request.part_ir:
-            part = Part.model_validate(request.part_ir)
+            part = PART_ADAPTER.validate_python(request.part_ir)
             # Generate DXF from part (simplified)
             # In full implementation, would generate proper DXF with entities
             dxf_content = f"0\nSECTION\n2\nHEADER\n0\nENDSEC\n0\nEOF\n"  # Minimal DXF
@@ -5,8 +5,11 @@ Note: This is a placeholder. Real FEA would likely be offloaded to a specialized
 """
 
 from fastapi import APIRouter, HTTPException
-from app.core.ir import Part
-from app.core.builder import build_cad_model
+from app.core.ir import Part, PART_ADAPTER
+from app.core.builder import tessellation_to_arrays
+from app.core.build_cache import build_cad_model_cached
+from app.core.geometry_utils import tessellate_cached
+from app.core.workers import run_cad_job
 from app.api.schemas import (
     FeaLinearStaticRequest, FeaLinearStaticResponse, MeshData,
     BoundaryCondition, Load, Material
@@ -24,46 +27,47 @@ async def fea_linear_static(request: FeaLinearStaticRequest):
     and would likely be offloaded to a separate service (e.g., CalculiX, Abaqus).
     """
     try:
-        part = Part.model_validate(request.part_ir)
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
-        # Build the CadQuery model
-        wp = build_cad_model(part)
-        solid = wp.val()
-        
-        # MVP: Placeholder implementation
-        # Full implementation would:
-        # 1. Generate FEA mesh
-        # 2. Apply boundary conditions
-        # 3. Apply loads
-        # 4. Solve linear system
-        # 5. Extract displacement and stress fields
-        
-        # For MVP: return placeholder results
-        # In production, this would call an external FEA solver
-        
-        # Generate mesh for displacement field (placeholder)
-        try:
-            mesh_result = solid.tessellate(0.1)
-            vertices = [[v.x, v.y, v.z] for v in mesh_result[0]]
-            faces = []
-            for tri in mesh_result[1]:
-                if len(tri) >= 3:
-                    faces.append([tri[0], tri[1], tri[2]])
-            
-            # Placeholder: zero displacement
-            displacement_mesh = MeshData(vertices=vertices, faces=faces)
-            stress_mesh = MeshData(vertices=vertices, faces=faces)
-        except:
-            displacement_mesh = None
-            stress_mesh = None
-        
-        return FeaLinearStaticResponse(
-            displacement_field=displacement_mesh,
-            stress_field=stress_mesh,
-            max_von_mises=0.0,  # Placeholder
-            max_displacement=0.0  # Placeholder
-        )
+        return await run_cad_job(_fea_linear_static, part)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"FEA analysis failed: {str(e)}")
 
+
+def _fea_linear_static(part: Part) -> FeaLinearStaticResponse:
+    """Build the part and compute placeholder FEA fields (blocking; runs on a worker thread)."""
+    # Build the CadQuery model
+    wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # MVP: Placeholder implementation
+    # Full implementation would:
+    # 1. Generate FEA mesh
+    # 2. Apply boundary conditions
+    # 3. Apply loads
+    # 4. Solve linear system
+    # 5. Extract displacement and stress fields
+    
+    # For MVP: return placeholder results
+    # In production, this would call an external FEA solver
+    
+    # Generate mesh for displacement field (placeholder)
+    try:
+        vertices_arr, faces_arr = tessellation_to_arrays(tessellate_cached(solid, 0.1))
+        vertices = vertices_arr.tolist()
+        faces = faces_arr.tolist()
+        
+        # Placeholder: zero displacement
+        displacement_mesh = MeshData(vertices=vertices, faces=faces)
+        stress_mesh = MeshData(vertices=vertices, faces=faces)
+    except:
+        displacement_mesh = None
+        stress_mesh = None
+    
+    return FeaLinearStaticResponse(
+        displacement_field=displacement_mesh,
+        stress_field=stress_mesh,
+        max_von_mises=0.0,  # Placeholder
+        max_displacement=0.0  # Placeholder
+    )
@@ -4,9 +4,8 @@ API routes for importing geometry files.
 
 from fastapi import APIRouter, HTTPException
 import base64
-import tempfile
-import os
-import cadquery as cq
+from app.core.build_cache import import_step_cached, step_cache_key
+from app.core.workers import run_cad_job
 from app.api.schemas import ImportStepRequest, ImportStepResponse
 
 router = APIRouter(prefix="/import", tags=["import"])
@@ -31,60 +30,52 @@ async def import_step(request: ImportStepRequest):
         else:
             raise HTTPException(status_code=400, detail="Either file_b64 or file_url must be provided")
         
-        # Write to temporary file
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.step', delete=False) as tmp:
-            tmp.write(step_data)
-            tmp_path = tmp.name
-        
         try:
-            # Import STEP using CadQuery
-            # Note: CadQuery's importStep may not be available in all versions
-            # This is a placeholder implementation
-            try:
-                # Try to import using CadQuery
-                imported = cq.importers.importStep(tmp_path)
-                
-                # Get BRep summary
-                if hasattr(imported, 'val'):
-                    solid = imported.val()
-                    brep_summary = {
-                        "volume": solid.Volume(),
-                        "area": solid.Area(),
-                        "is_valid": solid.isValid(),
-                        "face_count": 0,  # Would count faces in full implementation
-                        "edge_count": 0,
-                        "vertex_count": 0
-                    }
-                else:
-                    brep_summary = {
-                        "volume": 0.0,
-                        "area": 0.0,
-                        "is_valid": False,
-                        "face_count": 0,
-                        "edge_count": 0,
-                        "vertex_count": 0
-                    }
-                
-                # Create wrapper IR (read-only body reference)
-                wrapper_ir = {
-                    "name": "imported_geometry",
-                    "type": "imported_step",
-                    "file_reference": tmp_path,  # In production, would store reference
-                    "read_only": True
-                }
-                
-                return ImportStepResponse(
-                    brep_summary=brep_summary,
-                    wrapper_ir=wrapper_ir
-                )
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=f"STEP import failed: {str(e)}")
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+            # Import STEP using CadQuery (cached by file content)
+            return await run_cad_job(_import_step, step_data)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"STEP import failed: {str(e)}")
                 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Import failed: {str(e)}")
 
+
+def _import_step(step_data: bytes) -> ImportStepResponse:
+    """Import STEP bytes and summarize the BRep (blocking; runs on a worker thread)."""
+    imported = import_step_cached(step_data)
+    
+    # Get BRep summary
+    if hasattr(imported, 'val'):
+        solid = imported.val()
+        brep_summary = {
+            "volume": solid.Volume(),
+            "area": solid.Area(),
+            "is_valid": solid.isValid(),
+            "face_count": 0,  # Would count faces in full implementation
+            "edge_count": 0,
+            "vertex_count": 0
+        }
+    else:
+        brep_summary = {
+            "volume": 0.0,
+            "area": 0.0,
+            "is_valid": False,
+            "face_count": 0,
+            "edge_count": 0,
+            "vertex_count": 0
+        }
+    
+    # Create wrapper IR (read-only body reference)
+    wrapper_ir = {
+        "name": "imported_geometry",
+        "type": "imported_step",
+        "file_reference": step_cache_key(step_data),  # Content hash of the imported file
+        "read_only": True
+    }
+    
+    return ImportStepResponse(
+        brep_summary=brep_summary,
+        wrapper_ir=wrapper_ir
+    )
@@ -2,9 +2,23 @@
 API routes for advanced meshing and visualization.
 """
 
-from fastapi import APIRouter, HTTPException
-from app.core.ir import Part
-from app.core.builder import build_cad_model
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request, Response
+from OCP.gp import gp_Pnt, gp_Dir, gp_Pln
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Section
+from OCP.BRepAdaptor import BRepAdaptor_Curve
+from OCP.GCPnts import GCPnts_QuasiUniformDeflection
+from OCP.GeomAbs import GeomAbs_Line
+from OCP.TopAbs import TopAbs_EDGE
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopoDS import TopoDS
+from app.core.ir import Part, PART_ADAPTER
+from app.core.builder import tessellation_to_arrays
+from app.core.build_cache import build_cad_model_cached
+from app.core.mesh_utils import weld_vertices, optimize_vertex_fetch, quantize_vertices, pack_mesh
+from app.core.geometry_utils import tessellate_cached
+from app.core.etag import request_etag, not_modified
+from app.core.workers import run_cad_job
 from app.api.schemas import (
     MeshSolidRequest, MeshSolidResponse, MeshData, MeshParams,
     SectionPlaneRequest, SectionPlaneResponse, SectionCurve, PlaneDefinition
@@ -14,45 +28,23 @@ router = APIRouter(prefix="/mesh", tags=["mesh"])
 
 
 @router.post("/solid", response_model=MeshSolidResponse)
-async def mesh_solid(request: MeshSolidRequest):
+async def mesh_solid(request: MeshSolidRequest, http_request: Request, response: Response):
     """
     Generate a mesh from an OCC solid with given tolerance.
     
     Provides control over mesh quality separate from build.
+    Responses carry an ETag; resending it in If-None-Match returns 304.
     """
     try:
-        part = Part.model_validate(request.part_ir)
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
-        # Build the CadQuery model
-        wp = build_cad_model(part)
-        solid = wp.val()
+        etag = request_etag(http_request, request, part)
+        cached = not_modified(http_request, etag)
+        if cached is not None:
+            return cached
+        response.headers["ETag"] = etag
         
-        # Get mesh parameters
-        tolerance = request.mesh_params.linear_tolerance or 0.1
-        angle_tolerance = request.mesh_params.angle_tolerance
-        
-        # Generate mesh with custom tolerance
-        try:
-            mesh_result = solid.tessellate(tolerance)
-            vertices = [[v.x, v.y, v.z] for v in mesh_result[0]]
-            faces = []
-            
-            for tri in mesh_result[1]:
-                if len(tri) >= 3:
-                    faces.append([tri[0], tri[1], tri[2]])
-            
-            mesh_data = MeshData(vertices=vertices, faces=faces)
-            
-            metrics = {
-                "triangle_count": len(faces),
-                "vertex_count": len(vertices),
-                "linear_tolerance": tolerance,
-                "angle_tolerance": angle_tolerance
-            }
-            
-            return MeshSolidResponse(mesh=mesh_data, metrics=metrics)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Meshing failed: {str(e)}")
+        return await run_cad_job(_mesh_solid, part, request.mesh_params)
             
     except HTTPException:
         raise
@@ -60,6 +52,89 @@ async def mesh_solid(request: MeshSolidRequest):
         raise HTTPException(status_code=400, detail=f"Mesh generation failed: {str(e)}")
 
 
+def _mesh_arrays(part: Part, mesh_params: MeshParams) -> tuple[np.ndarray, np.ndarray]:
+    """Build the part and tessellate it into vertex/face arrays (blocking)."""
+    # Build the CadQuery model
+    wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # Generate mesh with custom tolerance
+    tolerance = mesh_params.linear_tolerance or 0.1
+    vertices, faces = tessellation_to_arrays(tessellate_cached(solid, tolerance))
+    if mesh_params.weld:
+        # Welding sorts vertices by position; restore first-use order for the GPU
+        vertices, faces = optimize_vertex_fetch(*weld_vertices(vertices, faces))
+    return vertices, faces
+
+
+def _mesh_solid(part: Part, mesh_params: MeshParams) -> MeshSolidResponse:
+    """Build the part and mesh it (blocking; runs on a worker thread)."""
+    try:
+        vertices_arr, faces_arr = _mesh_arrays(part, mesh_params)
+        vertices = vertices_arr.tolist()
+        faces = faces_arr.tolist()
+        
+        # Arrays come straight from the tessellator: skip per-element validation
+        mesh_data = MeshData.model_construct(vertices=vertices, faces=faces)
+        
+        metrics = {
+            "triangle_count": len(faces),
+            "vertex_count": len(vertices),
+            "linear_tolerance": mesh_params.linear_tolerance or 0.1,
+            "angle_tolerance": mesh_params.angle_tolerance
+        }
+        
+        return MeshSolidResponse(mesh=mesh_data, metrics=metrics)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Meshing failed: {str(e)}")
+
+
+@router.post(
+    "/solid/binary",
+    response_class=Response,
+    responses={200: {"content": {"application/octet-stream": {}}}}
+)
+async def mesh_solid_binary(request: MeshSolidRequest, http_request: Request):
+    """
+    Generate a mesh like /mesh/solid, returned as raw binary buffers.
+    
+    The body is little-endian float32 vertices (x, y, z) followed by uint32
+    triangle indices; the X-Vertex-Count and X-Triangle-Count headers give
+    the section sizes. Avoids the nested-list JSON encoding for large meshes.
+    
+    With mesh_params.quantize, vertices are uint16 instead (index section
+    padded to a 4-byte offset) and decode as q * X-Vertex-Scale + X-Vertex-Offset,
+    both given per axis as "x,y,z". ETag/If-None-Match work as for /mesh/solid.
+    """
+    try:
+        part = PART_ADAPTER.validate_python(request.part_ir)
+        
+        etag = request_etag(http_request, request, part)
+        cached = not_modified(http_request, etag)
+        if cached is not None:
+            return cached
+        
+        vertices, faces = await run_cad_job(_mesh_arrays, part, request.mesh_params)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Mesh generation failed: {str(e)}")
+    
+    headers = {
+        "ETag": etag,
+        "X-Vertex-Count": str(len(vertices)),
+        "X-Triangle-Count": str(len(faces))
+    }
+    if request.mesh_params.quantize:
+        vertices, offset, scale = quantize_vertices(vertices)
+        headers["X-Vertex-Offset"] = ",".join(repr(float(v)) for v in offset)
+        headers["X-Vertex-Scale"] = ",".join(repr(float(v)) for v in scale)
+    
+    return Response(
+        content=pack_mesh(vertices, faces),
+        media_type="application/octet-stream",
+        headers=headers
+    )
+
+
 @router.post("/section/plane", response_model=SectionPlaneResponse)
 async def section_plane(request: SectionPlaneRequest):
     """
@@ -68,61 +143,77 @@ async def section_plane(request: SectionPlaneRequest):
     Returns 2D section curves (wires) and optionally a 2D mesh.
     """
     try:
-        part = Part.model_validate(request.part_ir)
-        
-        # Build the CadQuery model
-        wp = build_cad_model(part)
-        solid = wp.val()
-        
-        # Create a plane from the definition
-        import cadquery as cq
-        from OCP.gp import gp_Pnt, gp_Dir, gp_Pln
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
-        point = gp_Pnt(*request.plane.point)
-        normal = gp_Dir(*request.plane.normal)
-        plane = gp_Pln(point, normal)
+        return await run_cad_job(_section_plane, part, request.plane)
+            
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Section computation failed: {str(e)}")
+
+
+def _section_plane(part: Part, plane_def: PlaneDefinition) -> SectionPlaneResponse:
+    """Build the part and section it with a plane (blocking; runs on a worker thread)."""
+    # Build the CadQuery model
+    wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # Create a plane from the definition
+    point = gp_Pnt(*plane_def.point)
+    normal = gp_Dir(*plane_def.normal)
+    plane = gp_Pln(point, normal)
+    
+    # For MVP: use CadQuery's section method if available
+    # This is a simplified implementation
+    try:
+        # Try to get a section using OCC
+        # Create a large face on the plane for intersection
+        # This is a simplified approach - full implementation would use proper sectioning
+        section = BRepAlgoAPI_Section(solid.wrapped, plane)
+        section.Build()
         
-        # For MVP: use CadQuery's section method if available
-        # This is a simplified implementation
-        try:
-            # Try to get a section using OCC
-            from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeFace
-            from OCP.BRepAlgoAPI import BRepAlgoAPI_Section
+        if section.IsDone():
+            result_shape = section.Shape()
             
-            # Create a large face on the plane for intersection
-            # This is a simplified approach - full implementation would use proper sectioning
-            section = BRepAlgoAPI_Section(solid.wrapped, plane)
-            section.Build()
+            # Sample every edge in 3D: lines by their endpoints, other
+            # curves within the default mesh deflection
+            curve_types, edge_points = [], []
+            edge_exp = TopExp_Explorer(result_shape, TopAbs_EDGE)
+            while edge_exp.More():
+                adaptor = BRepAdaptor_Curve(TopoDS.Edge_s(edge_exp.Current()))
+                if adaptor.GetType() == GeomAbs_Line:
+                    curve_types.append("line")
+                    samples = [adaptor.Value(adaptor.FirstParameter()), adaptor.Value(adaptor.LastParameter())]
+                else:
+                    curve_types.append("polyline")
+                    discretizer = GCPnts_QuasiUniformDeflection(adaptor, 0.1)
+                    samples = [discretizer.Value(i) for i in range(1, discretizer.NbPoints() + 1)]
+                edge_points.append([(p.X(), p.Y(), p.Z()) for p in samples])
+                edge_exp.Next()
             
-            if section.IsDone():
-                result_shape = section.Shape()
-                
-                # Extract edges from the section
-                from OCP.TopExp import TopExp_Explorer
-                from OCP.TopAbs import TopAbs_EDGE
-                
-                curves = []
-                edge_exp = TopExp_Explorer(result_shape, TopAbs_EDGE)
-                
-                while edge_exp.More():
-                    edge = edge_exp.Current()
-                    # Extract points from edge (simplified)
-                    # Full implementation would properly extract curve geometry
-                    curves.append(SectionCurve(
-                        type="line",  # Simplified - would detect actual curve type
-                        points=[[0, 0], [1, 0]]  # Placeholder
-                    ))
-                    edge_exp.Next()
-                
-                return SectionPlaneResponse(curves=curves, mesh_2d=None)
-            else:
-                # No intersection
+            if not edge_points:
                 return SectionPlaneResponse(curves=[], mesh_2d=None)
-                
-        except Exception as e:
-            # Fallback: return empty section
+            
+            # Project all samples onto the plane's in-plane axes at once
+            position = plane.Position()
+            origin = np.array(plane_def.point, dtype=np.float64)
+            basis = np.array([
+                [position.XDirection().X(), position.XDirection().Y(), position.XDirection().Z()],
+                [position.YDirection().X(), position.YDirection().Y(), position.YDirection().Z()]
+            ])
+            points_3d = np.array([p for points in edge_points for p in points], dtype=np.float64)
+            points_2d = (points_3d - origin) @ basis.T
+            
+            splits = np.cumsum([len(points) for points in edge_points])[:-1]
+            curves = [
+                SectionCurve(type=curve_type, points=points.tolist())
+                for curve_type, points in zip(curve_types, np.split(points_2d, splits))
+            ]
+            
+            return SectionPlaneResponse(curves=curves, mesh_2d=None)
+        else:
+            # No intersection
             return SectionPlaneResponse(curves=[], mesh_2d=None)
             
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Section computation failed: {str(e)}")
-
+        # Fallback: return empty section
+        return SectionPlaneResponse(curves=[], mesh_2d=None)
@@ -2,9 +2,16 @@
 API routes for selection mapping and topology utilities.
 """
 
+from typing import Any
+import cadquery as cq
+import numpy as np
 from fastapi import APIRouter, HTTPException
-from app.core.ir import Part
-from app.core.builder import build_cad_model
+from OCP.BRepIntCurveSurface import BRepIntCurveSurface_Inter
+from OCP.gp import gp_Pnt, gp_Lin, gp_Dir
+from app.core.ir import Part, PART_ADAPTER
+from app.core.build_cache import build_cad_model_cached
+from app.core.geometry_utils import face_bounding_boxes
+from app.core.workers import run_cad_job
 from app.api.schemas import (
     MapPickRequest, MapPickResponse, PickRay,
     TopologyTaggingRequest, TopologyTaggingResponse
@@ -21,65 +28,77 @@ async def map_pick(request: MapPickRequest):
     Useful for "click in 3D → know which feature/param to highlight".
     """
     try:
-        part = Part.model_validate(request.part_ir)
+        part = PART_ADAPTER.validate_python(request.part_ir)
         
-        # Build the CadQuery model
-        wp = build_cad_model(part)
-        solid = wp.val()
-        
-        # Create ray from request
-        ray_origin = request.pick_ray.origin
-        ray_dir = request.pick_ray.direction
-        
-        # For MVP: simplified ray casting
-        # Full implementation would:
-        # 1. Cast ray through solid
-        # 2. Find intersection with faces/edges/vertices
-        # 3. Map back to feature references
-        
-        try:
-            from OCP.BRepExtrema import BRepExtrema_DistShapeShape
-            from OCP.gp import gp_Pnt, gp_Lin, gp_Dir
-            
-            # Create ray as a line
-            ray_point = gp_Pnt(*ray_origin)
-            ray_direction = gp_Dir(*ray_dir)
-            ray_line = gp_Lin(ray_point, ray_direction)
-            
-            # Find closest point on solid to ray
-            # This is simplified - full implementation would find actual intersection
-            dist_calc = BRepExtrema_DistShapeShape(solid.wrapped, ray_line)
-            dist_calc.Perform()
-            
-            if dist_calc.IsDone() and dist_calc.NbSolution() > 0:
-                # Found intersection (simplified)
-                # In full implementation, would identify specific face/edge/vertex
-                return MapPickResponse(
-                    face_id="face_0",  # Placeholder
-                    edge_id=None,
-                    vertex_id=None,
-                    feature_reference=None  # Could map to feature name
-                )
-            else:
-                return MapPickResponse(
-                    face_id=None,
-                    edge_id=None,
-                    vertex_id=None,
-                    feature_reference=None
-                )
-        except Exception as e:
-            # Fallback: return no pick
-            return MapPickResponse(
-                face_id=None,
-                edge_id=None,
-                vertex_id=None,
-                feature_reference=None
-            )
+        return await run_cad_job(_map_pick, part, request.pick_ray)
             
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Pick mapping failed: {str(e)}")
 
 
+def _map_pick(part: Part, pick_ray: PickRay) -> MapPickResponse:
+    """Build the part and find the first face hit by the ray (blocking; runs on a worker thread)."""
+    # Build the CadQuery model
+    wp = build_cad_model_cached(part)
+    solid = wp.val()
+    
+    # MVP: faces only; edge/vertex picking and feature references could be added
+    try:
+        face_index = _first_hit_face(solid, pick_ray)
+    except Exception:
+        # Fallback: return no pick
+        face_index = None
+    
+    return MapPickResponse(
+        face_id=f"face_{face_index}" if face_index is not None else None,
+        edge_id=None,
+        vertex_id=None,
+        feature_reference=None
+    )
+
+
+def _first_hit_face(solid: cq.Shape, pick_ray: PickRay) -> int | None:
+    """
+    Find the index (in solid.Faces() order) of the nearest face hit by a ray.
+    
+    All face bounding boxes are slab-tested against the ray at once; only
+    faces whose box the ray enters are intersected exactly, nearest box first,
+    stopping once no remaining box can contain a closer hit.
+    """
+    faces, boxes = face_bounding_boxes(solid)
+    if not faces:
+        return None
+    
+    origin = np.asarray(pick_ray.origin, dtype=np.float64)
+    direction = np.asarray(pick_ray.direction, dtype=np.float64)
+    direction = direction / np.linalg.norm(direction)
+    
+    # Ray/box slab test; fmin/fmax skip the NaNs from 0 * inf on axis-parallel rays
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverse = 1.0 / direction
+        t_low = (boxes[:, 0] - origin) * inverse
+        t_high = (boxes[:, 1] - origin) * inverse
+    t_enter = np.maximum(np.fmax.reduce(np.fmin(t_low, t_high), axis=1), 0.0)
+    t_exit = np.fmin.reduce(np.fmax(t_low, t_high), axis=1)
+    candidates = np.flatnonzero(t_enter <= t_exit)
+    candidates = candidates[np.argsort(t_enter[candidates], kind="stable")]
+    
+    ray_line = gp_Lin(gp_Pnt(*origin), gp_Dir(*direction))
+    best_index, best_distance = None, np.inf
+    for i in candidates.tolist():
+        if t_enter[i] > best_distance:
+            break
+        intersector = BRepIntCurveSurface_Inter()
+        intersector.Init(faces[i].wrapped, ray_line, 1e-7)
+        while intersector.More():
+            # The line direction is normalized, so W is the distance along the ray
+            distance = intersector.W()
+            if 0.0 <= distance < best_distance:
+                best_index, best_distance = i, distance
+            intersector.Next()
+    return best_index
+
+
 @router.post("/topology/tagging", response_model=TopologyTaggingResponse)
 async def topology_tagging(request: TopologyTaggingRequest):
     """
@@ -91,6 +110,14 @@ async def topology_tagging(request: TopologyTaggingRequest):
         old_sig = request.old_solid_signature
         new_sig = request.new_solid_signature
         
+        # Unchanged geometry (the common rebuild case): every ID maps to itself
+        if old_sig == new_sig:
+            return TopologyTaggingResponse(
+                face_mapping=_identity_mapping(old_sig.get("faces")),
+                edge_mapping=_identity_mapping(old_sig.get("edges")),
+                vertex_mapping=_identity_mapping(old_sig.get("vertices"))
+            )
+        
         # MVP: Simplified topology mapping
         # Full implementation would:
         # 1. Compare solid signatures
@@ -109,3 +136,18 @@ async def topology_tagging(request: TopologyTaggingRequest):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Topology tagging failed: {str(e)}")
 
+
+def _identity_mapping(entries: Any) -> dict:
+    """
+    Map each topology ID listed in a signature section to itself.
+    
+    Accepts a list of IDs, a list of {"id": ...} records, or a dict keyed by ID;
+    anything else (e.g. count-only signatures) yields an empty mapping.
+    """
+    if isinstance(entries, dict):
+        ids = entries.keys()
+    elif isinstance(entries, list):
+        ids = [entry.get("id") if isinstance(entry, dict) else entry for entry in entries]
+    else:
+        return {}
+    return {str(id_): id_ for id_ in ids if id_ is not None}
@@ -24,13 +24,8 @@ async def health():
     )
 
 
-@router.get("/version", response_model=VersionResponse)
-async def version():
-    """
-    Version information endpoint.
-    
-    Returns versions of the geometry service, CadQuery, and OpenCascade.
-    """
+def _detect_versions() -> VersionResponse:
+    """Look up CadQuery and OpenCascade versions (fixed for the process lifetime)."""
     try:
         cadquery_version = cq.__version__
     except AttributeError:
@@ -54,3 +49,16 @@ async def version():
         occ_version=occ_version
     )
 
+
+# Computed once at import; /version is polled by monitoring
+_VERSION_RESPONSE = _detect_versions()
+
+
+@router.get("/version", response_model=VersionResponse)
+async def version():
+    """
+    Version information endpoint.
+    
+    Returns versions of the geometry service, CadQuery, and OpenCascade.
+    """
+    return _VERSION_RESPONSE
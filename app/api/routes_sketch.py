@@ -2,6 +2,9 @@
 API routes for sketch constraint solving.
 """
 
+from collections import defaultdict
+
+import numpy as np
 from fastapi import APIRouter, HTTPException
 from app.core.ir import Sketch
 from app.api.schemas import (
@@ -11,6 +14,9 @@ from app.api.schemas import (
 
 router = APIRouter(prefix="/sketch", tags=["sketch"])
 
+# Suggestion type for each column of the orientation mask in infer_constraints
+_ORIENTATION_TYPES = ("horizontal", "vertical")
+
 
 @router.post("/solve", response_model=SketchSolveResponse)
 async def sketch_solve(request: SketchSolveRequest):
@@ -28,12 +34,10 @@ async def sketch_solve(request: SketchSolveRequest):
         # 2. Solve for entity coordinates
         # 3. Return updated entities with DOF count
         
-        # For now, return entities as-is with basic DOF estimation
-        updated_entities = []
-        for entity in sketch.entities:
-            entity_dict = entity.model_dump()
-            # In full implementation, coordinates would be updated by solver
-            updated_entities.append(entity_dict)
+        # For now, return entities as-is with basic DOF estimation.
+        # Validated entities are passed through; the response serializer dumps them once.
+        # In full implementation, coordinates would be updated by solver (model_copy(update=...))
+        updated_entities = list(sketch.entities)
         
         # Estimate DOF (simplified)
         num_entities = len(sketch.entities)
@@ -73,68 +77,136 @@ async def infer_constraints(request: InferConstraintsRequest):
         sketch = Sketch.model_validate(request.sketch_ir)
         tolerance = request.tolerance
         
-        suggested_constraints = []
+        # Suggestions are collected as (type, entity_ids, confidence) tuples
+        # and only turned into dicts once, for the response
+        suggestions: list[tuple[str, list[str], float]] = []
         
-        # Analyze entities for constraint suggestions
-        # Horizontal/Vertical detection
-        for entity in sketch.entities:
-            if entity.type == "line" and entity.start and entity.end:
-                dx = entity.end[0] - entity.start[0]
-                dy = entity.end[1] - entity.start[1]
-                
-                # Check if approximately horizontal
-                if abs(dy) < tolerance:
-                    suggested_constraints.append({
-                        "type": "horizontal",
-                        "entity_ids": [entity.id],
-                        "confidence": 1.0 - abs(dy) / tolerance
-                    })
-                
-                # Check if approximately vertical
-                if abs(dx) < tolerance:
-                    suggested_constraints.append({
-                        "type": "vertical",
-                        "entity_ids": [entity.id],
-                        "confidence": 1.0 - abs(dx) / tolerance
-                    })
-        
-        # Equal length detection
+        # Gather line endpoints and candidate points (line ends, circle centers) as arrays
         lines = [e for e in sketch.entities if e.type == "line" and e.start and e.end]
-        for i, line1 in enumerate(lines):
-            for line2 in lines[i+1:]:
-                len1 = ((line1.end[0] - line1.start[0])**2 + (line1.end[1] - line1.start[1])**2)**0.5
-                len2 = ((line2.end[0] - line2.start[0])**2 + (line2.end[1] - line2.start[1])**2)**0.5
-                
-                if abs(len1 - len2) < tolerance:
-                    suggested_constraints.append({
-                        "type": "equal_length",
-                        "entity_ids": [line1.id, line2.id],
-                        "confidence": 1.0 - abs(len1 - len2) / tolerance
-                    })
-        
-        # Coincident point detection
-        points = []
+        point_coords, point_ids = [], []
         for entity in sketch.entities:
             if entity.type == "line" and entity.start and entity.end:
-                points.append((entity.start, entity.id, "start"))
-                points.append((entity.end, entity.id, "end"))
+                point_coords += [entity.start[:2], entity.end[:2]]
+                point_ids += [entity.id, entity.id]
             elif entity.type == "circle" and entity.center:
-                points.append((entity.center, entity.id, "center"))
+                point_coords.append(entity.center[:2])
+                point_ids.append(entity.id)
         
-        for i, (p1, id1, type1) in enumerate(points):
-            for p2, id2, type2 in points[i+1:]:
-                dist = ((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)**0.5
-                if dist < tolerance and id1 != id2:
-                    suggested_constraints.append({
-                        "type": "coincident",
-                        "entity_ids": [id1, id2],
-                        "confidence": 1.0 - dist / tolerance
-                    })
+        if lines:
+            starts = np.array([line.start[:2] for line in lines], dtype=np.float64)
+            ends = np.array([line.end[:2] for line in lines], dtype=np.float64)
+            abs_dx = np.abs(ends[:, 0] - starts[:, 0])
+            abs_dy = np.abs(ends[:, 1] - starts[:, 1])
+            
+            # Horizontal/Vertical detection: one (N, 2) mask of [horizontal, vertical];
+            # row-major nonzero keeps each line's horizontal before its vertical
+            offsets = np.stack([abs_dy, abs_dx], axis=1)
+            rows, cols = np.nonzero(offsets < tolerance)
+            suggestions.extend(
+                (_ORIENTATION_TYPES[col], [lines[row].id], confidence)
+                for row, col, confidence in zip(
+                    rows.tolist(), cols.tolist(), (1.0 - offsets[rows, cols] / tolerance).tolist()
+                )
+            )
+            
+            # Equal length detection over line pairs i < j of similar length
+            lengths = np.hypot(abs_dx, abs_dy)
+            first, second = _close_value_pairs(lengths, tolerance)
+            length_diff = np.abs(lengths[first] - lengths[second])
+            matches = np.flatnonzero(length_diff < tolerance)
+            suggestions.extend(
+                ("equal_length", [lines[i].id, lines[j].id], confidence)
+                for i, j, confidence in zip(
+                    first[matches].tolist(),
+                    second[matches].tolist(),
+                    (1.0 - length_diff[matches] / tolerance).tolist()
+                )
+            )
         
-        return InferConstraintsResponse(
-            suggested_constraints=suggested_constraints
-        )
+        # Coincident point detection over point pairs i < j of different entities
+        if point_coords:
+            points = np.array(point_coords, dtype=np.float64)
+            owner_codes = {}
+            owners = np.array([owner_codes.setdefault(id_, len(owner_codes)) for id_ in point_ids])
+            first, second = _nearby_pairs(points, tolerance)
+            dists = np.hypot(*(points[first] - points[second]).T)
+            matches = np.flatnonzero((dists < tolerance) & (owners[first] != owners[second]))
+            suggestions.extend(
+                ("coincident", [point_ids[i], point_ids[j]], confidence)
+                for i, j, confidence in zip(
+                    first[matches].tolist(),
+                    second[matches].tolist(),
+                    (1.0 - dists[matches] / tolerance).tolist()
+                )
+            )
+        
+        # Suggestions are built from validated entities: skip re-validating the dicts
+        return InferConstraintsResponse.model_construct(suggested_constraints=[
+            {"type": kind, "entity_ids": entity_ids, "confidence": confidence}
+            for kind, entity_ids, confidence in suggestions
+        ])
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Constraint inference failed: {str(e)}")
 
+
+def _close_value_pairs(values: np.ndarray, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find candidate index pairs (i < j) of values that may differ by less than tolerance.
+    
+    Values are sorted once; each value is then paired only with the following
+    sorted values up to value + tolerance, found by binary search, instead of
+    with every other value.
+    
+    Returns:
+        Arrays (first, second) of candidate pairs in (i, j) order
+    """
+    count = len(values)
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    # Inclusive bound so rounding in value + tolerance cannot drop a pair
+    ends = np.searchsorted(sorted_values, sorted_values + tolerance, side="right")
+    spans = np.maximum(ends - np.arange(count) - 1, 0)
+    
+    # Expand each sorted position k into partners k+1 .. k+span
+    lower = np.repeat(np.arange(count), spans)
+    offsets = np.arange(len(lower)) - np.repeat(np.cumsum(spans) - spans, spans) + 1
+    a, b = order[lower], order[lower + offsets]
+    
+    first, second = np.minimum(a, b), np.maximum(a, b)
+    pair_order = np.lexsort((second, first))
+    return first[pair_order], second[pair_order]
+
+
+def _nearby_pairs(points: np.ndarray, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find candidate index pairs (i < j) of points that may lie within tolerance.
+    
+    Points are bucketed on a grid with cell size = tolerance, so any pair
+    closer than the tolerance is in the same or an adjacent cell. Only those
+    9 cells are probed per point instead of comparing all pairs.
+    
+    Returns:
+        Arrays (first, second) of candidate pairs in (i, j) order
+    """
+    if tolerance <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    
+    cells = np.floor(points / tolerance).astype(np.int64).tolist()
+    buckets: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for i, (cx, cy) in enumerate(cells):
+        buckets[(cx, cy)].append(i)
+    
+    first, second = [], []
+    for i, (cx, cy) in enumerate(cells):
+        for ox in (-1, 0, 1):
+            for oy in (-1, 0, 1):
+                for j in buckets.get((cx + ox, cy + oy), ()):
+                    if j > i:
+                        first.append(i)
+                        second.append(j)
+    
+    first = np.array(first, dtype=np.int64)
+    second = np.array(second, dtype=np.int64)
+    order = np.lexsort((second, first))
+    return first[order], second[order]
@@ -7,7 +7,7 @@ These Pydantic models define the API contract for all geometry service endpoints
 from typing import Literal, Optional, Any
 from pydantic import BaseModel, Field
 
-from app.core.ir import Part, Sketch
+from app.core.ir import Part, Sketch, SketchEntity
 
 
 # ============================================================================
@@ -34,9 +34,9 @@ class VersionResponse(BaseModel):
 class BuildSolidRequest(BaseModel):
     """Request for building a solid from PartIR."""
     part_ir: dict = Field(..., description="Part IR as JSON dict")
-    detail_level: Literal["coarse", "normal", "high"] = Field(
+    detail_level: Literal["coarse", "normal", "high", "multi"] = Field(
         default="normal",
-        description="Mesh detail level (affects tessellation tolerance)"
+        description="Mesh detail level (affects tessellation tolerance); \"multi\" returns a high-detail mesh plus coarser LODs"
     )
     return_mesh: bool = Field(default=True, description="Whether to return mesh data")
 
@@ -65,6 +65,10 @@ class MeshData(BaseModel):
 class BuildSolidResponse(BaseModel):
     """Response from building a solid."""
     mesh: Optional[MeshData] = Field(None, description="Mesh data (if return_mesh=True)")
+    lods: Optional[dict[str, MeshData]] = Field(
+        None,
+        description="Coarser levels of detail by name (\"normal\", \"coarse\"), for detail_level=\"multi\""
+    )
     bounding_box: BoundingBox = Field(..., description="3D bounding box")
     topology_summary: TopologySummary = Field(..., description="Topology statistics")
     status: str = Field(default="ok", description="Build status")
@@ -125,6 +129,14 @@ class MeshParams(BaseModel):
     """Mesh generation parameters."""
     linear_tolerance: Optional[float] = Field(None, description="Linear tolerance for meshing")
     angle_tolerance: Optional[float] = Field(None, description="Angle tolerance for meshing")
+    weld: bool = Field(
+        default=False,
+        description="Merge vertices shared between B-rep faces (smaller mesh, but smooth-shaded across sharp edges)"
+    )
+    quantize: bool = Field(
+        default=False,
+        description="Encode binary mesh positions as uint16 over the bounding box (see X-Vertex-Scale/X-Vertex-Offset)"
+    )
 
 
 class ExportStlRequest(BaseModel):
@@ -180,8 +192,8 @@ class MassPropertiesResponse(BaseModel):
     volume: float = Field(..., description="Volume in m³")
     area: float = Field(..., description="Surface area in m²")
     center_of_mass: list[float] = Field(..., description="Center of mass [x, y, z]")
-    principal_moments: list[float] = Field(..., description="Principal moments of inertia [Ixx, Iyy, Izz]")
-    principal_axes: list[list[float]] = Field(..., description="Principal axes [[x, y, z], ...]")
+    principal_moments: list[float] = Field(..., description="Principal moments of inertia [I1, I2, I3] in ascending order")
+    principal_axes: list[list[float]] = Field(..., description="Principal axes [[x, y, z], ...], one row per principal moment")
 
 
 # ============================================================================
@@ -329,7 +341,7 @@ class SketchSolveRequest(BaseModel):
 
 class SketchSolveResponse(BaseModel):
     """Response from sketch constraint solving."""
-    updated_entities: list[dict] = Field(..., description="Updated entity coordinates")
+    updated_entities: list[SketchEntity] = Field(..., description="Updated entity coordinates")
     degrees_of_freedom: int = Field(..., description="Remaining DOF count")
     constraint_status: ConstraintStatus = Field(..., description="Constraint status")
     errors: list[str] = Field(default_factory=list, description="Errors if inconsistent")
@@ -5,7 +5,10 @@ This module evaluates parameters with tolerances and calculates
 1D dimensional chains (stackups) using worst-case analysis.
 """
 
+import bisect
 from typing import Optional
+
+import numpy as np
 from app.core.ir import Part, Param, Chain, ValidationIssue, Sketch, SketchEntity, SketchConstraint, SketchDimension, Feature
 
 
@@ -28,6 +31,31 @@ TOLERANCE_LOOKUP: dict[str, dict[tuple[float, float], tuple[float, float]]] = {
     # Add more tolerance classes as needed
 }
 
+def _build_tolerance_index() -> dict[str, tuple[list[float], list[float], list[tuple[float, float]], tuple[float, float]]]:
+    """
+    Flatten TOLERANCE_LOOKUP for binary-search range lookup.
+    
+    Returns:
+        dict mapping tolerance class to (sorted range lower bounds, upper bounds,
+        deviations, fallback deviations); ranges must not overlap
+    """
+    index = {}
+    for tolerance_class, ranges in TOLERANCE_LOOKUP.items():
+        if not ranges:
+            continue
+        sorted_ranges = sorted(ranges.items())
+        index[tolerance_class] = (
+            [low for (low, _), _ in sorted_ranges],
+            [high for (_, high), _ in sorted_ranges],
+            [deviations for _, deviations in sorted_ranges],
+            # Nominals outside every range use the last range of the table
+            list(ranges.values())[-1],
+        )
+    return index
+
+
+_TOLERANCE_INDEX = _build_tolerance_index()
+
 
 def get_tolerance_deviations(param: Param) -> tuple[float, float]:
     """
@@ -42,25 +70,17 @@ def get_tolerance_deviations(param: Param) -> tuple[float, float]:
     if not param.tolerance_class:
         return (0.0, 0.0)
     
-    tolerance_class = param.tolerance_class
-    if tolerance_class not in TOLERANCE_LOOKUP:
-        # Unknown tolerance class: return zero deviation
+    index = _TOLERANCE_INDEX.get(param.tolerance_class)
+    if index is None:
+        # Unknown (or empty) tolerance class: return zero deviation
         return (0.0, 0.0)
     
-    # Find the appropriate range for the nominal value
-    nominal = param.value
-    ranges = TOLERANCE_LOOKUP[tolerance_class]
-    
-    for (min_nominal, max_nominal), (min_dev, max_dev) in ranges.items():
-        if min_nominal <= nominal < max_nominal:
-            return (min_dev, max_dev)
-    
-    # Default: use the last range or zero
-    if ranges:
-        last_range = list(ranges.values())[-1]
-        return last_range
-    
-    return (0.0, 0.0)
+    # Find the range whose [min, max) contains the nominal value
+    lows, highs, deviations, fallback = index
+    i = bisect.bisect_right(lows, param.value) - 1
+    if i >= 0 and param.value < highs[i]:
+        return deviations[i]
+    return fallback
 
 
 def evaluate_param_with_tolerance(param: Param) -> dict[str, float]:
@@ -120,21 +140,44 @@ def evaluate_chain(part: Part, chain: Chain) -> dict[str, float]:
     }
 
 
+def _evaluate_param_arrays(part: Part) -> tuple[dict[str, int], np.ndarray]:
+    """
+    Evaluate every parameter of a part once.
+    
+    Returns:
+        Tuple of (parameter name -> row index, (N, 3) array of nominal/min/max rows)
+    """
+    index = {name: i for i, name in enumerate(part.params)}
+    values = np.empty((len(index), 3), dtype=np.float64)
+    for i, param in enumerate(part.params.values()):
+        min_dev, max_dev = get_tolerance_deviations(param)
+        values[i] = (param.value, param.value + min_dev, param.value + max_dev)
+    return index, values
+
+
 def evaluate_all_chains(part: Part) -> dict[str, dict[str, float]]:
     """
     Evaluate all chains in a part.
     
+    Parameters are evaluated once and shared between chains; each chain is
+    then a single sum over its terms' rows.
+    
     Args:
         part: The part to evaluate
         
     Returns:
         dict mapping chain name to evaluation result
     """
-    results = {}
-    for chain in part.chains:
-        results[chain.name] = evaluate_chain(part, chain)
-    
-    return results
+    index, values = _evaluate_param_arrays(part)
+    return {chain.name: _sum_chain(chain, index, values) for chain in part.chains}
+
+
+def _sum_chain(chain: Chain, index: dict[str, int], values: np.ndarray) -> dict[str, float]:
+    """Sum a chain's term rows from _evaluate_param_arrays (nominal/min/max)."""
+    # Terms that are not parameters are skipped, as in evaluate_chain
+    rows = [index[term] for term in chain.terms if term in index]
+    nominal_sum, min_sum, max_sum = values[rows].sum(axis=0).tolist()
+    return {"nominal": nominal_sum, "min": min_sum, "max": max_sum}
 
 
 def evaluate_all_params(part: Part) -> dict[str, dict[str, float]]:
@@ -147,11 +190,11 @@ def evaluate_all_params(part: Part) -> dict[str, dict[str, float]]:
     Returns:
         dict mapping parameter name to evaluation result
     """
-    results = {}
-    for param_name, param in part.params.items():
-        results[param_name] = evaluate_param_with_tolerance(param)
-    
-    return results
+    index, values = _evaluate_param_arrays(part)
+    return {
+        name: {"nominal": nominal, "min": min_value, "max": max_value}
+        for name, (nominal, min_value, max_value) in zip(index, values.tolist())
+    }
 
 
 def validate_part(part: Part) -> list[ValidationIssue]:
@@ -221,30 +264,36 @@ def validate_part(part: Part) -> list[ValidationIssue]:
             ))
     
     # Check tolerance feasibility for chains with targets
-    for chain in part.chains:
-        if chain.target_value is not None and chain.target_tolerance is not None:
-            chain_eval = evaluate_chain(part, chain)
-            target_min = chain.target_value - chain.target_tolerance
-            target_max = chain.target_value + chain.target_tolerance
-            
-            if chain_eval["min"] > target_max or chain_eval["max"] < target_min:
-                issues.append(ValidationIssue(
-                    code="TOLERANCE_INFEASIBLE",
-                    severity="error",
-                    message=f"Chain '{chain.name}' cannot meet target tolerance. "
-                           f"Actual range: [{chain_eval['min']:.3f}, {chain_eval['max']:.3f}], "
-                           f"Target: [{target_min:.3f}, {target_max:.3f}]",
-                    related_chains=[chain.name],
-                    related_params=chain.terms
-                ))
-            elif chain_eval["min"] < target_min or chain_eval["max"] > target_max:
-                issues.append(ValidationIssue(
-                    code="TOLERANCE_TIGHT",
-                    severity="warning",
-                    message=f"Chain '{chain.name}' is close to target tolerance limits",
-                    related_chains=[chain.name],
-                    related_params=chain.terms
-                ))
+    targeted_chains = [
+        chain for chain in part.chains
+        if chain.target_value is not None and chain.target_tolerance is not None
+    ]
+    if targeted_chains:
+        # Evaluate each parameter once for all chains
+        index, values = _evaluate_param_arrays(part)
+    for chain in targeted_chains:
+        chain_eval = _sum_chain(chain, index, values)
+        target_min = chain.target_value - chain.target_tolerance
+        target_max = chain.target_value + chain.target_tolerance
+        
+        if chain_eval["min"] > target_max or chain_eval["max"] < target_min:
+            issues.append(ValidationIssue(
+                code="TOLERANCE_INFEASIBLE",
+                severity="error",
+                message=f"Chain '{chain.name}' cannot meet target tolerance. "
+                       f"Actual range: [{chain_eval['min']:.3f}, {chain_eval['max']:.3f}], "
+                       f"Target: [{target_min:.3f}, {target_max:.3f}]",
+                related_chains=[chain.name],
+                related_params=chain.terms
+            ))
+        elif chain_eval["min"] < target_min or chain_eval["max"] > target_max:
+            issues.append(ValidationIssue(
+                code="TOLERANCE_TIGHT",
+                severity="warning",
+                message=f"Chain '{chain.name}' is close to target tolerance limits",
+                related_chains=[chain.name],
+                related_params=chain.terms
+            ))
     
     # MVP: Removed generic underconstrained model check (too generic)
     # MVP: Removed critical features check (not in MVP scope)
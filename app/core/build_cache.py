@@ -0,0 +1,234 @@
+"""
+Content-addressed cache of built CAD models.
+
+Analysis endpoints are frequently called several times in a row for the same
+Part IR (validation, then mass properties, then clearance). Built models are
+cached under a hash of the validated IR so repeated requests skip the CAD kernel.
+Imported STEP files are cached the same way, keyed by a hash of the file bytes.
+Geometry validation results are cached under the same key as the model.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import cadquery as cq
+
+from app.core.ir import Part
+from app.core.builder import build_cad_model, apply_feature
+from app.core.geometry_utils import validate_geometry
+
+
+# Maximum number of built models kept in memory (least recently used are evicted)
+BUILD_CACHE_SIZE = int(os.getenv("BUILD_CACHE_SIZE", "64"))
+# Maximum number of imported STEP models kept in memory
+IMPORT_CACHE_SIZE = int(os.getenv("IMPORT_CACHE_SIZE", "16"))
+
+_cache: OrderedDict[str, cq.Workplane] = OrderedDict()
+# Build state after each feature prefix: (workplane, feature_history)
+_prefix_cache: OrderedDict[str, tuple[cq.Workplane, dict[str, cq.Workplane]]] = OrderedDict()
+_import_cache: OrderedDict[str, cq.Workplane] = OrderedDict()
+# validate_geometry results: (is_valid, issues)
+_validation_cache: OrderedDict[str, tuple[bool, list[dict]]] = OrderedDict()
+_lock = threading.Lock()  # Builds run on worker threads
+
+
+def _lookup(cache: OrderedDict, key: str) -> Any:
+    """Get a cache entry and mark it most recently used (None on a miss)."""
+    with _lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _store(cache: OrderedDict, key: str, value: Any, max_size: int) -> None:
+    """Insert a cache entry, evicting the least recently used beyond max_size."""
+    with _lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+
+def part_cache_key(part: Part) -> str:
+    """
+    Compute the cache key for a part.
+
+    The validated model is serialized rather than the raw request dict, so
+    equivalent IRs (e.g. 10 vs 10.0) map to the same key.
+
+    Args:
+        part: Validated Part IR
+
+    Returns:
+        Hex digest identifying the part's content
+    """
+    return hashlib.blake2b(part.model_dump_json().encode(), digest_size=16).hexdigest()
+
+
+def build_cad_model_cached(part: Part) -> cq.Workplane:
+    """
+    Build a part's CadQuery model, reusing a cached result for identical IR.
+
+    The returned workplane may be shared between requests and must be treated
+    as read-only.
+
+    Args:
+        part: Validated Part IR
+
+    Returns:
+        CadQuery Workplane with the built model
+    """
+    return _build_cached(part, part_cache_key(part))
+
+
+def _build_cached(part: Part, key: str) -> cq.Workplane:
+    """build_cad_model_cached with a precomputed part_cache_key."""
+    wp = _lookup(_cache, key)
+    if wp is not None:
+        return wp
+
+    # Build outside the lock; concurrent misses on the same key just build twice
+    wp = build_cad_model(part)
+    _store(_cache, key, wp, BUILD_CACHE_SIZE)
+    return wp
+
+
+def validate_geometry_cached(part: Part) -> tuple[bool, list[dict]]:
+    """
+    Build a part and validate its geometry, reusing a cached result for
+    identical IR.
+
+    Args:
+        part: Validated Part IR
+
+    Returns:
+        Tuple of (is_valid, list of issues), as from validate_geometry
+    """
+    key = part_cache_key(part)
+    result = _lookup(_validation_cache, key)
+    if result is None:
+        result = validate_geometry(_build_cached(part, key).val())
+        _store(_validation_cache, key, result, BUILD_CACHE_SIZE)
+
+    is_valid, issues = result
+    return is_valid, list(issues)
+
+
+def _prefix_cache_keys(part: Part) -> list[str]:
+    """
+    Cache keys for the build state after each feature prefix.
+
+    Key i covers features 0..i plus everything an extrude may read from
+    elsewhere in the part: params, standalone sketches, and sketch features
+    (which can be referenced before they appear).
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(part.model_dump_json(exclude={"features"}).encode())
+    for feature in part.features:
+        if feature.type == "sketch":
+            hasher.update(feature.model_dump_json().encode())
+
+    keys = []
+    for feature in part.features:
+        hasher.update(feature.model_dump_json().encode())
+        keys.append(hasher.copy().hexdigest())
+    return keys
+
+
+def build_cad_model_up_to_feature_cached(part: Part, feature_name: str) -> cq.Workplane:
+    """
+    Build a part up to and including a feature, resuming from the longest
+    cached feature prefix.
+
+    Like build_cad_model_cached, the returned workplane must be treated as
+    read-only.
+
+    Args:
+        part: Validated Part IR
+        feature_name: Name of the last feature to apply
+
+    Returns:
+        CadQuery Workplane with the model after that feature
+
+    Raises:
+        ValueError: If the part has no feature with that name
+    """
+    names = [f.name for f in part.features]
+    if feature_name not in names:
+        raise ValueError(f"Feature '{feature_name}' not found")
+    target = names.index(feature_name)
+
+    # Keys are computed before building (building fills in detected profiles)
+    keys = _prefix_cache_keys(part)[:target + 1]
+
+    wp = cq.Workplane("XY")
+    feature_history: dict[str, cq.Workplane] = {}
+    start = 0
+    for i in range(target, -1, -1):
+        state = _lookup(_prefix_cache, keys[i])
+        if state is not None:
+            wp, history = state
+            feature_history = dict(history)
+            start = i + 1
+            break
+
+    for i in range(start, target + 1):
+        wp = apply_feature(part, part.features[i], wp, feature_history)
+        _store(_prefix_cache, keys[i], (wp, dict(feature_history)), BUILD_CACHE_SIZE)
+    return wp
+
+
+def step_cache_key(step_data: bytes) -> str:
+    """
+    Compute the cache key for a STEP file.
+
+    Args:
+        step_data: Raw STEP file bytes
+
+    Returns:
+        Hex digest identifying the file's content
+    """
+    return hashlib.blake2b(step_data, digest_size=16).hexdigest()
+
+
+def import_step_cached(step_data: bytes) -> cq.Workplane:
+    """
+    Import a STEP file, reusing a cached result for identical file content.
+
+    Like build_cad_model_cached, the returned workplane must be treated as
+    read-only.
+
+    Args:
+        step_data: Raw STEP file bytes
+
+    Returns:
+        CadQuery Workplane with the imported shapes
+    """
+    key = step_cache_key(step_data)
+    wp = _lookup(_import_cache, key)
+    if wp is not None:
+        return wp
+
+    # The STEP reader needs a file path
+    with tempfile.TemporaryDirectory() as import_dir:
+        path = os.path.join(import_dir, "import.step")
+        with open(path, "wb") as f:
+            f.write(step_data)
+        wp = cq.importers.importStep(path)
+
+    _store(_import_cache, key, wp, IMPORT_CACHE_SIZE)
+    return wp
+
+
+def clear_build_cache() -> None:
+    """Drop all cached models."""
+    with _lock:
+        _cache.clear()
+        _prefix_cache.clear()
+        _import_cache.clear()
+        _validation_cache.clear()
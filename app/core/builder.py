@@ -5,25 +5,57 @@ This module takes a Part IR object and builds the corresponding 3D geometry
 using CadQuery, then exports it as mesh data for the frontend.
 """
 
+import base64
+import functools
+import logging
 import cadquery as cq
+import numpy as np
 from typing import Any
 from app.core.ir import Part, Feature, Param, Sketch
 from app.core.profile_detection import detect_profiles
+from app.core.geometry_utils import (
+    tessellate_cached, calculate_bounding_box, topology_summary_from_shape,
+    mass_properties_from_shape, validate_geometry, shape_lock, exact_bounding_box
+)
+
+logger = logging.getLogger(__name__)
 
 
 class MeshData:
-    """Simple mesh data structure for frontend consumption."""
+    """
+    Simple mesh data structure for frontend consumption.
+    
+    Vertices and faces are held as compact NumPy buffers (float32 / int32);
+    they are only expanded to nested lists when serialized with ``to_dict``.
+    """
     
-    def __init__(self, vertices: list[list[float]], faces: list[list[int]], feature_id: str | None = None):
-        self.vertices = vertices  # List of [x, y, z] coordinates
-        self.faces = faces  # List of face indices (triangles: [i, j, k])
+    def __init__(self, vertices: Any, faces: Any, feature_id: str | None = None):
+        self.vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)  # (N, 3) [x, y, z] coordinates
+        self.faces = np.asarray(faces, dtype=np.int32).reshape(-1, 3)  # (M, 3) triangle indices [i, j, k]
         self.feature_id = feature_id  # Associated feature name for selection
     
     def to_dict(self) -> dict:
         """Convert to JSON-serializable dict."""
         result = {
-            "vertices": self.vertices,
-            "faces": self.faces
+            "vertices": self.vertices.tolist(),
+            "faces": self.faces.tolist()
+        }
+        if self.feature_id:
+            result["featureId"] = self.feature_id
+        return result
+    
+    def to_binary_dict(self) -> dict:
+        """
+        Convert to a compact JSON-serializable dict with base64-encoded buffers.
+        
+        Buffers are little-endian float32 (vertices) and int32 (faces), suitable
+        for decoding directly into typed arrays on the client.
+        """
+        result = {
+            "verticesB64": base64.b64encode(self.vertices.astype("<f4", copy=False).tobytes()).decode("ascii"),
+            "verticesShape": list(self.vertices.shape),
+            "facesB64": base64.b64encode(self.faces.astype("<i4", copy=False).tobytes()).decode("ascii"),
+            "facesShape": list(self.faces.shape)
         }
         if self.feature_id:
             result["featureId"] = self.feature_id
@@ -37,39 +69,39 @@ class MultiMeshData:
         self.meshes = meshes
         self.face_to_feature = face_to_feature  # Optional: direct face-to-feature mapping
     
-    def to_dict(self) -> dict:
-        """Convert to JSON-serializable dict with combined mesh and feature mapping."""
+    def combined(self) -> tuple[MeshData, list[str | None]]:
+        """Combine all meshes into one, tracking which faces belong to which feature."""
         if self.face_to_feature and self.meshes:
             # Use provided face_to_feature mapping with first mesh
-            mesh = self.meshes[0]
-            return {
-                "vertices": mesh.vertices,
-                "faces": mesh.faces,
-                "faceToFeature": self.face_to_feature
-            }
+            return self.meshes[0], self.face_to_feature
         
-        # Combine all meshes into one, but track which faces belong to which feature
-        all_vertices: list[list[float]] = []
-        all_faces: list[list[int]] = []
-        face_to_feature: list[str | None] = []  # Maps face index to feature_id
+        if not self.meshes:
+            return MeshData(vertices=[], faces=[]), []
         
-        vertex_offset = 0
+        # Offset each mesh's face indices by the vertices that precede it
+        offsets = np.cumsum([0] + [len(mesh.vertices) for mesh in self.meshes[:-1]])
+        vertices = np.concatenate([mesh.vertices for mesh in self.meshes])
+        faces = np.concatenate([mesh.faces + offset for mesh, offset in zip(self.meshes, offsets)])
+        face_to_feature: list[str | None] = []  # Maps face index to feature_id
         for mesh in self.meshes:
-            # Add vertices
-            all_vertices.extend(mesh.vertices)
-            
-            # Add faces with offset indices
-            for face in mesh.faces:
-                all_faces.append([v + vertex_offset for v in face])
-                face_to_feature.append(mesh.feature_id)
-            
-            vertex_offset += len(mesh.vertices)
-        
+            face_to_feature.extend([mesh.feature_id] * len(mesh.faces))
+        return MeshData(vertices=vertices, faces=faces), face_to_feature
+    
+    def to_dict(self) -> dict:
+        """Convert to JSON-serializable dict with combined mesh and feature mapping."""
+        mesh, face_to_feature = self.combined()
         return {
-            "vertices": all_vertices,
-            "faces": all_faces,
+            "vertices": mesh.vertices.tolist(),
+            "faces": mesh.faces.tolist(),
             "faceToFeature": face_to_feature  # Maps each face to its feature_id
         }
+    
+    def to_binary_dict(self) -> dict:
+        """Convert to a compact dict with base64-encoded buffers (see ``MeshData.to_binary_dict``)."""
+        mesh, face_to_feature = self.combined()
+        result = mesh.to_binary_dict()
+        result["faceToFeature"] = face_to_feature
+        return result
 
 
 def _build_profile_workplane_on_face(
@@ -209,11 +241,11 @@ def _build_profile_workplane(sketch: Sketch, distance: float) -> cq.Workplane |
                 return result_wp
             except Exception as cut_error:
                 # Final fallback: bounding box
-                print(f"Warning: Both face and 3D cut methods failed: {face_error}, {cut_error}")
+                logger.warning("Both face and 3D cut methods failed: %s, %s", face_error, cut_error)
                 return _build_bounding_box_workplane(sketch, distance)
         except Exception as ocp_error:
             # Fallback: use workplane method (simpler but may not support holes)
-            print(f"Warning: OCP face creation failed, using workplane fallback: {ocp_error}")
+            logger.warning("OCP face creation failed, using workplane fallback: %s", ocp_error)
             outer_wp = _build_2d_profile_from_entities(outer_profile, sketch)
             if outer_wp:
                 # For MVP, just extrude outer without holes if OCP fails
@@ -221,7 +253,7 @@ def _build_profile_workplane(sketch: Sketch, distance: float) -> cq.Workplane |
             return _build_bounding_box_workplane(sketch, distance)
     except Exception as e:
         # Fallback to bounding box if wire construction fails
-        print(f"Warning: Profile construction failed, using bounding box: {e}")
+        logger.warning("Profile construction failed, using bounding box: %s", e)
         return _build_bounding_box_workplane(sketch, distance)
 
 
@@ -257,7 +289,7 @@ def _build_2d_profile_from_entities(profile, sketch: Sketch) -> cq.Workplane | N
         # In full implementation, would build proper wire from connected lines
         return _build_bounding_box_workplane_2d(profile_entities)
     except Exception as e:
-        print(f"Warning: 2D profile construction failed: {e}")
+        logger.warning("2D profile construction failed: %s", e)
         return _build_bounding_box_workplane_2d(profile_entities)
 
 
@@ -394,7 +426,7 @@ def _build_wire_from_profile(profile, sketch: Sketch) -> cq.Wire | None:
         # Fallback: create bounding box
         return _build_bounding_box_wire(profile_entities)
     except Exception as e:
-        print(f"Warning: Wire construction failed: {e}")
+        logger.warning("Wire construction failed: %s", e)
         return _build_bounding_box_wire(profile_entities)
 
 
@@ -786,13 +818,159 @@ def _resolve_plane_to_workplane(plane_ref: str, part: Part, current_wp: cq.Workp
     return cq.Workplane("XY")
 
 
+def _bbox_max_extent(
+    xmin: float, xmax: float,
+    ymin: float, ymax: float,
+    zmin: float, zmax: float
+) -> float:
+    """Largest axis-aligned extent of a bounding box given as scalars."""
+    return max(xmax - xmin, ymax - ymin, zmax - zmin)
+
+
+def _through_all_extent(
+    xmin: float, xmax: float,
+    ymin: float, ymax: float,
+    zmin: float, zmax: float,
+    dx: float, dy: float, dz: float
+) -> float:
+    """
+    Distance a "through_all" cut must travel to clear a bounding box.
+    
+    Pure-float kernel (no CadQuery objects) so callers unpack the bounding box
+    once. For MVP, uses the maximum box dimension along the direction; axes
+    where the direction component is negligible contribute their full extent.
+    """
+    ex = abs(xmax - xmin)
+    ey = abs(ymax - ymin)
+    ez = abs(zmax - zmin)
+    adx = abs(dx)
+    ady = abs(dy)
+    adz = abs(dz)
+    return max(
+        ex * adx if adx > 0.1 else ex,
+        ey * ady if ady > 0.1 else ey,
+        ez * adz if adz > 0.1 else ez
+    )
+
+
+# Overshoot added to a "to_next" raycast hit so the cut fully clears the face
+TO_NEXT_EPSILON = 1e-3
+
+# Attribute used to keep a loaded ray intersector on a solid (see _raycast_next_face_distance)
+_RAY_INTERSECTOR_ATTR = "_eidos_ray_intersector"
+
+
+def _sketch_center(sketch: Sketch) -> tuple[float, float] | None:
+    """Get the bounding-box center of a sketch's entities (XY coordinates)."""
+    min_x = min_y = float('inf')
+    max_x = max_y = float('-inf')
+    
+    for entity in sketch.entities:
+        if entity.type == "line" and entity.start and entity.end:
+            min_x = min(min_x, entity.start[0], entity.end[0])
+            max_x = max(max_x, entity.start[0], entity.end[0])
+            min_y = min(min_y, entity.start[1], entity.end[1])
+            max_y = max(max_y, entity.start[1], entity.end[1])
+        elif entity.type == "rectangle" and entity.corner1 and entity.corner2:
+            min_x = min(min_x, entity.corner1[0], entity.corner2[0])
+            max_x = max(max_x, entity.corner1[0], entity.corner2[0])
+            min_y = min(min_y, entity.corner1[1], entity.corner2[1])
+            max_y = max(max_y, entity.corner1[1], entity.corner2[1])
+        elif entity.type == "circle" and entity.center and entity.radius:
+            min_x = min(min_x, entity.center[0] - entity.radius)
+            max_x = max(max_x, entity.center[0] + entity.radius)
+            min_y = min(min_y, entity.center[1] - entity.radius)
+            max_y = max(max_y, entity.center[1] + entity.radius)
+    
+    if min_x == float('inf'):
+        return None
+    
+    return ((min_x + max_x) / 2, (min_y + max_y) / 2)
+
+
+def _to_next_origin(sketch: Sketch, sketch_plane_wp: cq.Workplane) -> tuple[float, float, float] | None:
+    """
+    Get the start point of a "to_next" raycast: the sketch center on its plane.
+    
+    Profiles are built and extruded on the global XY plane (see
+    _build_profile_workplane), so the ray only follows the cut for sketches on
+    that plane. Other planes return None and use the bounding-box depth.
+    
+    Args:
+        sketch: Sketch being extruded
+        sketch_plane_wp: Workplane the sketch plane resolved to
+        
+    Returns:
+        Ray origin (x, y, z), or None if no raycast should be made
+    """
+    plane = sketch_plane_wp.plane
+    if abs(plane.origin.z) > 1e-9 or (plane.zDir - cq.Vector(0, 0, 1)).Length > 1e-9:
+        return None
+    
+    center = _sketch_center(sketch)
+    return (center[0], center[1], 0.0) if center else None
+
+
+def _raycast_next_face_distance(
+    solid: cq.Shape,
+    origin: tuple[float, float, float],
+    direction: tuple[float, float, float],
+    max_distance: float
+) -> float | None:
+    """
+    Find the distance along a ray to the nearest face of a solid.
+    
+    Hits at the ray origin (the sketch plane itself) are ignored. The loaded
+    intersector is kept on the solid, so later raycasts against the same body
+    (another "to_next" cut, or a rebuild from the prefix cache) skip loading it.
+    
+    Args:
+        solid: CadQuery Shape to intersect
+        origin: Ray origin (x, y, z)
+        direction: Ray direction (x, y, z)
+        max_distance: Upper bound of the ray parameter
+        
+    Returns:
+        Distance to the first face beyond the origin, or None if nothing was hit
+    """
+    try:
+        from OCP.IntCurvesFace import IntCurvesFace_ShapeIntersector
+        from OCP.gp import gp_Pnt, gp_Dir, gp_Lin
+        
+        # Perform() keeps its results in the intersector, which is shared with
+        # the solid (possibly across worker threads via the prefix cache)
+        with shape_lock(solid):
+            intersector = getattr(solid, _RAY_INTERSECTOR_ATTR, None)
+            if intersector is None:
+                intersector = IntCurvesFace_ShapeIntersector()
+                intersector.Load(solid.wrapped, 1e-6)
+                setattr(solid, _RAY_INTERSECTOR_ATTR, intersector)
+            
+            ray = gp_Lin(gp_Pnt(*origin), gp_Dir(*direction))
+            intersector.Perform(ray, 0.0, max_distance)
+            
+            if not intersector.IsDone():
+                return None
+            
+            nearest = None
+            for i in range(1, intersector.NbPnt() + 1):
+                w = intersector.WParameter(i)
+                if w > TO_NEXT_EPSILON and (nearest is None or w < nearest):
+                    nearest = w
+            return nearest
+    except Exception as e:
+        logger.warning("to_next raycast failed, using bounding box: %s", e)
+        return None
+
+
 def _resolve_extrude_distance(
     distance_param: str | float,
     part: Part,
     sketch_wp: cq.Workplane,
     current_wp: cq.Workplane,
     operation: str,
-    direction: tuple[float, float, float]
+    direction: tuple[float, float, float],
+    origin: tuple[float, float, float] | None = None
 ) -> float:
     """
     Resolve extrude distance, handling "through_all" and "to_next" modes.
@@ -804,6 +982,7 @@ def _resolve_extrude_distance(
         current_wp: Current workplane (for "to_next" calculation)
         operation: "join" or "cut"
         direction: Extrusion direction vector
+        origin: Start point of the "to_next" raycast (sketch center), if known
         
     Returns:
         Resolved distance as float
@@ -818,14 +997,12 @@ def _resolve_extrude_distance(
             if operation == "cut" and current_wp.objects:
                 # Get bounding box of current body
                 solid = current_wp.val()
-                bbox = solid.BoundingBox()
+                bbox = exact_bounding_box(solid)
                 # Calculate distance needed in the extrusion direction
-                # For MVP, use the maximum dimension along the direction
                 # In full implementation, would raycast along direction to find exit point
-                max_dim = max(
-                    abs(bbox.xmax - bbox.xmin) * abs(direction[0]) if abs(direction[0]) > 0.1 else abs(bbox.xmax - bbox.xmin),
-                    abs(bbox.ymax - bbox.ymin) * abs(direction[1]) if abs(direction[1]) > 0.1 else abs(bbox.ymax - bbox.ymin),
-                    abs(bbox.zmax - bbox.zmin) * abs(direction[2]) if abs(direction[2]) > 0.1 else abs(bbox.zmax - bbox.zmin)
+                max_dim = _through_all_extent(
+                    bbox.xmin, bbox.xmax, bbox.ymin, bbox.ymax, bbox.zmin, bbox.zmax,
+                    direction[0], direction[1], direction[2]
                 )
                 # Add a safety margin
                 return max_dim * 1.5 if max_dim > 0 else 100.0
@@ -836,15 +1013,24 @@ def _resolve_extrude_distance(
         elif distance_param == "to_next":
             # Extrude until hitting the next surface
             if operation == "cut" and current_wp.objects:
-                # For MVP, use a large distance (in full implementation, would raycast)
                 solid = current_wp.val()
-                bbox = solid.BoundingBox()
-                max_dim = max(
-                    abs(bbox.xmax - bbox.xmin),
-                    abs(bbox.ymax - bbox.ymin),
-                    abs(bbox.zmax - bbox.zmin)
+                bbox = exact_bounding_box(solid)
+                
+                # Cast a bounded ray from the sketch center and stop at the first face hit.
+                # Profiles are always extruded along the XY workplane normal in the MVP
+                # builder (see _build_profile_workplane), so the ray follows that axis.
+                if origin is not None:
+                    hit = _raycast_next_face_distance(
+                        solid, origin, (0.0, 0.0, 1.0), bbox.DiagonalLength
+                    )
+                    if hit is not None:
+                        return hit + TO_NEXT_EPSILON
+                
+                # Fallback: use a large distance that should hit the opposite face
+                max_dim = _bbox_max_extent(
+                    bbox.xmin, bbox.xmax, bbox.ymin, bbox.ymax, bbox.zmin, bbox.zmax
                 )
-                return max_dim  # Should hit the opposite face
+                return max_dim
             else:
                 return 10.0
         
@@ -854,23 +1040,22 @@ def _resolve_extrude_distance(
     return 10.0  # Default fallback
 
 
-def _get_extrude_direction(
-    direction_param: str | list[float] | None,
-    sketch_wp: cq.Workplane,
+@functools.lru_cache(maxsize=128)
+def _extrude_direction_for(
+    direction_key: str | tuple | None,
     operation: str
 ) -> tuple[float, float, float]:
     """
-    Get extrude direction vector.
+    Resolve a hashable direction parameter to a direction vector (cached).
     
     Args:
-        direction_param: Direction parameter ("normal", "reverse", [x, y, z], or None)
-        sketch_wp: Workplane of the sketch
+        direction_key: "normal", "reverse", (x, y, z) tuple, or None
         operation: "join" or "cut" (affects default direction for cuts)
         
     Returns:
         Direction vector as (x, y, z)
     """
-    if direction_param is None:
+    if direction_key is None:
         # Default: use workplane normal
         # For MVP, assume Z direction (0, 0, 1) for XY plane
         if operation == "cut":
@@ -879,22 +1064,51 @@ def _get_extrude_direction(
         else:
             return (0, 0, 1)
     
-    if isinstance(direction_param, str):
-        if direction_param == "normal":
+    if isinstance(direction_key, str):
+        if direction_key == "normal":
             # Use workplane normal (positive)
             return (0, 0, 1)
-        elif direction_param == "reverse":
+        elif direction_key == "reverse":
             # Reverse of normal
             return (0, 0, -1)
     
-    if isinstance(direction_param, list) and len(direction_param) == 3:
+    if isinstance(direction_key, tuple) and len(direction_key) == 3:
         # Explicit direction vector
-        return tuple(direction_param)
+        return direction_key
     
     # Default
     return (0, 0, 1) if operation == "join" else (0, 0, -1)
 
 
+def _get_extrude_direction(
+    direction_param: str | list[float] | None,
+    sketch_wp: cq.Workplane,
+    operation: str
+) -> tuple[float, float, float]:
+    """
+    Get extrude direction vector.
+    
+    Args:
+        direction_param: Direction parameter ("normal", "reverse", [x, y, z], or None)
+        sketch_wp: Workplane of the sketch
+        operation: "join" or "cut" (affects default direction for cuts)
+        
+    Returns:
+        Direction vector as (x, y, z)
+    """
+    # Normalize to a hashable cache key; unsupported values map to "" (the default)
+    if isinstance(direction_param, list):
+        direction_param = tuple(direction_param) if len(direction_param) == 3 else ""
+    elif direction_param is not None and not isinstance(direction_param, str):
+        direction_param = ""
+    
+    try:
+        return _extrude_direction_for(direction_param, operation)
+    except TypeError:
+        # Unhashable vector components (malformed IR): use the default
+        return _extrude_direction_for("", operation)
+
+
 def build_cad_model(part: Part) -> cq.Workplane:
     """
     Build a CadQuery model from a Part IR.
@@ -911,88 +1125,138 @@ def build_cad_model(part: Part) -> cq.Workplane:
     # Process features in order
     # MVP: Only sketch and extrude features are supported
     for feature in part.features:
-        if feature.type not in ["sketch", "extrude"]:
-            raise ValueError(f"Feature type '{feature.type}' not supported in MVP. Only 'sketch' and 'extrude' are available.")
+        wp = apply_feature(part, feature, wp, feature_history)
+    
+    return wp
+
+
+def apply_feature(
+    part: Part,
+    feature: Feature,
+    wp: cq.Workplane,
+    feature_history: dict[str, cq.Workplane]
+) -> cq.Workplane:
+    """
+    Apply a single feature to the model built so far.
+    
+    Args:
+        part: The part being built
+        feature: Feature to apply
+        wp: Workplane with the model built from the preceding features
+        feature_history: feature_name -> workplane map (updated in place)
         
-        if feature.type == "sketch":
-            # Sketches don't build geometry directly - they're 2D profiles
-            # Geometry is built when they're used in extrude features
-            # For now, just skip (no-op)
-            pass
+    Returns:
+        cq.Workplane: The workplane after applying the feature
+    """
+    if feature.type not in ["sketch", "extrude"]:
+        raise ValueError(f"Feature type '{feature.type}' not supported in MVP. Only 'sketch' and 'extrude' are available.")
+    
+    if feature.type == "sketch":
+        # Sketches don't build geometry directly - they're 2D profiles
+        # Geometry is built when they're used in extrude features
+        # For now, just skip (no-op)
+        pass
+    
+    elif feature.type == "extrude":
+        # Extrude a sketch into 3D
+        sketch_ref = feature.params.get("sketch") or feature.params.get("sketch_name")
+        distance_param = feature.params.get("distance") or feature.params.get("distance_param")
+        operation = feature.params.get("operation", "join")  # "join" or "cut"
+        direction_param = feature.params.get("direction")  # Optional: "normal", "reverse", [x, y, z]
         
-        elif feature.type == "extrude":
-            # Extrude a sketch into 3D
-            sketch_ref = feature.params.get("sketch") or feature.params.get("sketch_name")
-            distance_param = feature.params.get("distance") or feature.params.get("distance_param")
-            operation = feature.params.get("operation", "join")  # "join" or "cut"
-            direction_param = feature.params.get("direction")  # Optional: "normal", "reverse", [x, y, z]
-            
-            if not sketch_ref:
-                raise ValueError(f"Extrude feature '{feature.name}' missing sketch reference")
-            if not distance_param:
-                raise ValueError(f"Extrude feature '{feature.name}' missing distance parameter")
-            
-            # Find the sketch (could be in part.sketches or embedded in a sketch feature)
-            sketch = None
-            if isinstance(sketch_ref, str):
-                # Look for sketch by name
-                for s in part.sketches:
-                    if s.name == sketch_ref:
-                        sketch = s
-                        break
-                # Also check sketch features
-                if not sketch:
-                    for f in part.features:
-                        if f.type == "sketch" and f.sketch and f.name == sketch_ref:
-                            sketch = f.sketch
-                            break
-            
+        if not sketch_ref:
+            raise ValueError(f"Extrude feature '{feature.name}' missing sketch reference")
+        if not distance_param:
+            raise ValueError(f"Extrude feature '{feature.name}' missing distance parameter")
+        
+        # Find the sketch (could be in part.sketches or embedded in a sketch feature)
+        sketch = None
+        if isinstance(sketch_ref, str):
+            # Look for sketch by name
+            for s in part.sketches:
+                if s.name == sketch_ref:
+                    sketch = s
+                    break
+            # Also check sketch features
             if not sketch:
-                raise ValueError(f"Sketch '{sketch_ref}' not found for extrude feature '{feature.name}'")
-            
-            # Resolve sketch plane to workplane (handles face references)
-            sketch_plane_wp = _resolve_plane_to_workplane(sketch.plane, part, wp, feature_history)
-            
-            # Get extrude direction first (needed for distance resolution)
-            direction = _get_extrude_direction(direction_param, sketch_plane_wp, operation)
-            
-            # Resolve distance (handles "through_all", "to_next", etc.)
-            distance = _resolve_extrude_distance(distance_param, part, sketch_plane_wp, wp, operation, direction)
-            
-            # Detect profiles if not already present
-            if not sketch.profiles:
-                sketch.profiles = detect_profiles(sketch)
-            
-            # Detect profiles if not already present
-            if not sketch.profiles:
-                sketch.profiles = detect_profiles(sketch)
-            
-            # Build 2D profile from detected profiles (outer boundary + holes)
-            # Note: _build_profile_workplane uses the sketch's plane, but we need to use sketch_plane_wp
-            extrude_wp = _build_profile_workplane_on_face(sketch, distance, sketch_plane_wp, direction)
-            
-            if not extrude_wp:
-                raise ValueError(f"Sketch '{sketch_ref}' has no valid geometry for extrusion")
-            
-            if operation == "cut":
-                # For cut, we need existing geometry
-                if wp.objects:
-                    wp = wp.cut(extrude_wp)
-                else:
-                    raise ValueError(f"Cannot cut from empty geometry in feature '{feature.name}'")
-            else:  # join
-                # For join, if wp is empty, just use the extrude_wp directly
-                if wp.objects:
-                    wp = wp.union(extrude_wp)
-                else:
-                    wp = extrude_wp
-            
-            # Store in feature history for future face references
-            feature_history[feature.name] = wp
+                for f in part.features:
+                    if f.type == "sketch" and f.sketch and f.name == sketch_ref:
+                        sketch = f.sketch
+                        break
+        
+        if not sketch:
+            raise ValueError(f"Sketch '{sketch_ref}' not found for extrude feature '{feature.name}'")
+        
+        # Resolve sketch plane to workplane (handles face references)
+        sketch_plane_wp = _resolve_plane_to_workplane(sketch.plane, part, wp, feature_history)
+        
+        # Get extrude direction first (needed for distance resolution)
+        direction = _get_extrude_direction(direction_param, sketch_plane_wp, operation)
+        
+        # Resolve distance (handles "through_all", "to_next", etc.)
+        origin = None
+        if distance_param == "to_next":
+            origin = _to_next_origin(sketch, sketch_plane_wp)
+        distance = _resolve_extrude_distance(
+            distance_param, part, sketch_plane_wp, wp, operation, direction, origin
+        )
+        
+        # Detect profiles if not already present (once per sketch object)
+        if not sketch._profiles_detected:
+            sketch.profiles = sketch.profiles or detect_profiles(sketch)
+            sketch._profiles_detected = True
+        
+        # Build 2D profile from detected profiles (outer boundary + holes)
+        # Note: _build_profile_workplane uses the sketch's plane, but we need to use sketch_plane_wp
+        extrude_wp = _build_profile_workplane_on_face(sketch, distance, sketch_plane_wp, direction)
+        
+        if not extrude_wp:
+            raise ValueError(f"Sketch '{sketch_ref}' has no valid geometry for extrusion")
+        
+        if operation == "cut":
+            # For cut, we need existing geometry
+            if wp.objects:
+                wp = wp.cut(extrude_wp)
+            else:
+                raise ValueError(f"Cannot cut from empty geometry in feature '{feature.name}'")
+        else:  # join
+            # For join, if wp is empty, just use the extrude_wp directly
+            if wp.objects:
+                wp = wp.union(extrude_wp)
+            else:
+                wp = extrude_wp
+        
+        # Store in feature history for future face references
+        feature_history[feature.name] = wp
     
     return wp
 
 
+def tessellation_to_arrays(
+    mesh: tuple[list, list],
+    vertex_dtype: type = np.float64
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a CadQuery tessellation result into NumPy vertex and face arrays.
+    
+    Args:
+        mesh: (vertices, triangles) tuple as returned by ``Shape.tessellate``
+        vertex_dtype: Floating point dtype for the vertex array
+        
+    Returns:
+        Tuple of (N, 3) vertices and (M, 3) int32 triangle indices
+    """
+    points, triangles = mesh
+    vertices = np.fromiter(
+        (c for v in points for c in (v.x, v.y, v.z)),
+        dtype=vertex_dtype,
+        count=3 * len(points)
+    ).reshape(-1, 3)
+    # tessellate() always emits triangles, so the index list is uniform
+    faces = np.asarray(triangles, dtype=np.int32).reshape(-1, 3)
+    return vertices, faces
+
+
 def generate_mesh(part: Part, per_feature: bool = False) -> MeshData | MultiMeshData:
     """
     Generate mesh data from a Part IR.
@@ -1009,45 +1273,87 @@ def generate_mesh(part: Part, per_feature: bool = False) -> MeshData | MultiMesh
     solid = wp.val()
     
     try:
-        mesh = solid.tessellate(0.1)
-        vertices = [[v.x, v.y, v.z] for v in mesh[0]]
-        faces = []
+        mesh = tessellate_cached(solid, 0.1)
+        vertices_arr, faces_arr = tessellation_to_arrays(mesh, vertex_dtype=np.float32)
+        num_faces = len(faces_arr)
         face_to_feature: list[str | None] = []
         
-        # Convert triangles to face indices
-        for tri in mesh[1]:
-            if len(tri) == 3:
-                faces.append([tri[0], tri[1], tri[2]])
-                # For MVP: assign faces to features based on order
-                # In a full implementation, we'd track which feature created which geometry
-                if per_feature and part.features:
-                    # Simple heuristic: assign faces to features in order
-                    # This is a placeholder - proper implementation would track feature contributions
-                    feature_index = min(len(faces) // (len(mesh[1]) // len(part.features) + 1), len(part.features) - 1)
-                    face_to_feature.append(part.features[feature_index].name if feature_index < len(part.features) else None)
-                else:
-                    face_to_feature.append(None)
+        # For MVP: assign faces to features based on order
+        # In a full implementation, we'd track which feature created which geometry
+        if per_feature and part.features:
+            # Simple heuristic: assign faces to features in order
+            # This is a placeholder - proper implementation would track feature contributions
+            feature_names = np.array([f.name for f in part.features], dtype=object)
+            bucket = num_faces // len(part.features) + 1
+            # Bucket boundaries are computed once; digitize clamps to the last feature
+            boundaries = np.arange(1, len(part.features)) * bucket
+            feature_indices = np.digitize(np.arange(1, num_faces + 1), boundaries)
+            face_to_feature = feature_names[feature_indices].tolist()
+        else:
+            face_to_feature = [None] * num_faces
         
         if per_feature and face_to_feature:
             # Return as MultiMeshData format (single mesh with faceToFeature mapping)
-            single_mesh = MeshData(vertices=vertices, faces=faces)
+            single_mesh = MeshData(vertices=vertices_arr, faces=faces_arr)
             multi = MultiMeshData([single_mesh], face_to_feature=face_to_feature)
             return multi
         else:
-            return MeshData(vertices=vertices, faces=faces)
+            return MeshData(vertices=vertices_arr, faces=faces_arr)
             
     except Exception as e:
-        print(f"Warning: Mesh generation failed: {e}")
+        logger.warning("Mesh generation failed: %s", e)
         return MeshData(vertices=[], faces=[])
 
 
+def compute_all(part: Part, tolerance: float = 0.1, density: float | None = None) -> dict[str, Any]:
+    """
+    Build a part once and compute mesh, bounding box, topology, mass and validation.
+    
+    All metrics are derived from the same solid (and its underlying OCC shape),
+    so the model is built and unwrapped only once.
+    
+    Args:
+        part: The part IR to evaluate
+        tolerance: Linear tessellation tolerance for the mesh
+        density: Material density in kg/m³ (optional)
+        
+    Returns:
+        Dict with mesh (MeshData), bbox, topology, mass, is_valid and issues
+    """
+    wp = build_cad_model(part)
+    solid = wp.val()
+    shape = solid.wrapped
+    
+    # Exact box, taken before meshing so it never depends on the triangulation
+    bbox = calculate_bounding_box(solid)
+    vertices, faces = tessellation_to_arrays(tessellate_cached(solid, tolerance), vertex_dtype=np.float32)
+    is_valid, issues = validate_geometry(solid)
+    
+    return {
+        "mesh": MeshData(vertices=vertices, faces=faces),
+        "bbox": bbox,
+        "topology": topology_summary_from_shape(shape),
+        "mass": mass_properties_from_shape(shape, density),
+        "is_valid": is_valid,
+        "issues": issues
+    }
+
+
 def build_cad_model_up_to_feature(part: Part, feature_name: str) -> cq.Workplane:
     """
     Build CadQuery model up to and including a specific feature.
     Used for per-feature mesh generation.
-    This is a simplified version - for MVP we use the full build_cad_model.
+    
+    Raises:
+        ValueError: If the part has no feature with that name
     """
-    # For MVP, just build the full model
-    # In a full implementation, this would build incrementally
-    return build_cad_model(part)
+    wp = cq.Workplane("XY")
+    feature_history: dict[str, cq.Workplane] = {}
+    
+    for feature in part.features:
+        wp = apply_feature(part, feature, wp, feature_history)
+        if feature.name == feature_name:
+            return wp
+    
+    raise ValueError(f"Feature '{feature_name}' not found")
 
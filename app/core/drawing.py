@@ -5,10 +5,27 @@ MVP: Generates a front view (XY plane projection) with auto-dimensions
 from DSL dimension entries.
 """
 
+import io
+import math
+import numpy as np
 from typing import Optional
 from app.core.ir import Part, Sketch, SketchEntity, SketchDimension
 
 
+# SVG element templates (%-formatting is cheaper than f-strings for plain floats)
+_LINE_TEMPLATE = '    <line x1="%.2f" y1="%.2f" x2="%.2f" y2="%.2f" stroke="#000" stroke-width="2" />\n'
+_CIRCLE_TEMPLATE = '    <circle cx="%.2f" cy="%.2f" r="%.2f" stroke="#000" stroke-width="2" fill="none" />\n'
+_RECT_TEMPLATE = '    <rect x="%.2f" y="%.2f" width="%.2f" height="%.2f" stroke="#000" stroke-width="2" fill="none" />\n'
+_LENGTH_DIM_TEMPLATE = (
+    '    <line x1="%.2f" y1="%.2f" x2="%.2f" y2="%.2f" stroke="#0066cc" stroke-width="1" />\n'
+    '    <text x="%.2f" y="%.2f" fill="#0066cc" font-size="12">%s %s</text>\n'
+)
+_DIAMETER_DIM_TEMPLATE = (
+    '    <line x1="%.2f" y1="%.2f" x2="%.2f" y2="%.2f" stroke="#0066cc" stroke-width="1" marker-end="url(#arrowhead)" marker-start="url(#arrowhead)" />\n'
+    '    <text x="%.2f" y="%.2f" text-anchor="middle" fill="#0066cc" font-size="12">⌀%s %s</text>\n'
+)
+
+
 def generate_front_view_svg(part: Part, width: int = 800, height: int = 600) -> str:
     """
     Generate a simple SVG front view of a part.
@@ -24,10 +41,6 @@ def generate_front_view_svg(part: Part, width: int = 800, height: int = 600) ->
     Returns:
         SVG string
     """
-    # Calculate bounding box from all sketches
-    min_x = min_y = float('inf')
-    max_x = max_y = float('-inf')
-    
     # Collect all sketches (from sketch features or part.sketches)
     all_sketches: list[Sketch] = []
     for feature in part.features:
@@ -41,31 +54,39 @@ def generate_front_view_svg(part: Part, width: int = 800, height: int = 600) ->
   <text x="{width//2}" y="{height//2}" text-anchor="middle" fill="#999">No sketches to display</text>
 </svg>'''
     
-    # Find bounding box from all sketch entities
+    # Collect drawable entities and their defining points (world coordinates)
+    drawables: list[SketchEntity] = []
+    world_pts: list[tuple[float, float]] = []
+    radii: list[float] = []  # Per point: circle radius, 0 for line/rectangle points
     for sketch in all_sketches:
         for entity in sketch.entities:
             if entity.type == "line" and entity.start and entity.end:
-                min_x = min(min_x, entity.start[0], entity.end[0])
-                max_x = max(max_x, entity.start[0], entity.end[0])
-                min_y = min(min_y, entity.start[1], entity.end[1])
-                max_y = max(max_y, entity.start[1], entity.end[1])
+                drawables.append(entity)
+                world_pts.append((entity.start[0], entity.start[1]))
+                world_pts.append((entity.end[0], entity.end[1]))
+                radii.extend((0.0, 0.0))
             elif entity.type == "circle" and entity.center and entity.radius:
-                min_x = min(min_x, entity.center[0] - entity.radius)
-                max_x = max(max_x, entity.center[0] + entity.radius)
-                min_y = min(min_y, entity.center[1] - entity.radius)
-                max_y = max(max_y, entity.center[1] + entity.radius)
+                drawables.append(entity)
+                world_pts.append((entity.center[0], entity.center[1]))
+                radii.append(entity.radius)
             elif entity.type == "rectangle" and entity.corner1 and entity.corner2:
-                min_x = min(min_x, entity.corner1[0], entity.corner2[0])
-                max_x = max(max_x, entity.corner1[0], entity.corner2[0])
-                min_y = min(min_y, entity.corner1[1], entity.corner2[1])
-                max_y = max(max_y, entity.corner1[1], entity.corner2[1])
+                drawables.append(entity)
+                world_pts.append((entity.corner1[0], entity.corner1[1]))
+                world_pts.append((entity.corner2[0], entity.corner2[1]))
+                radii.extend((0.0, 0.0))
     
-    if min_x == float('inf'):
+    if not drawables:
         # No valid entities
         return f'''<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
   <text x="{width//2}" y="{height//2}" text-anchor="middle" fill="#999">No geometry to display</text>
 </svg>'''
     
+    # Find bounding box from all sketch entities (circles extend by their radius)
+    pts = np.array(world_pts, dtype=np.float64)
+    r = np.array(radii, dtype=np.float64)[:, None]
+    min_x, min_y = (pts - r).min(axis=0).tolist()
+    max_x, max_y = (pts + r).max(axis=0).tolist()
+    
     # Add padding
     padding = 50
     range_x = max_x - min_x
@@ -87,54 +108,56 @@ def generate_front_view_svg(part: Part, width: int = 800, height: int = 600) ->
     offset_x = width / 2 - center_x * scale
     offset_y = height / 2 + center_y * scale  # Flip Y axis
     
+    # Transform all entity points to SVG coordinates in one pass (Y axis flipped)
+    svg_pts = (pts * np.array([scale, -scale]) + np.array([offset_x, offset_y])).tolist()
+    
     def world_to_svg(x: float, y: float) -> tuple[float, float]:
         """Convert world coordinates to SVG coordinates."""
-        svg_x = x * scale + offset_x
-        svg_y = -y * scale + offset_y  # Flip Y
-        return (svg_x, svg_y)
+        return (x * scale + offset_x, -y * scale + offset_y)
     
     # Build SVG
-    svg_lines = [
-        f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">',
-        '  <defs>',
-        '    <marker id="arrowhead" markerWidth="10" markerHeight="10" refX="9" refY="3" orient="auto">',
-        '      <polygon points="0 0, 10 3, 0 6" fill="#333" />',
-        '    </marker>',
-        '  </defs>',
-        '  <g id="geometry">'
-    ]
-    
-    # Draw entities
-    for sketch in all_sketches:
-        for entity in sketch.entities:
-            if entity.type == "line" and entity.start and entity.end:
-                x1, y1 = world_to_svg(entity.start[0], entity.start[1])
-                x2, y2 = world_to_svg(entity.end[0], entity.end[1])
-                svg_lines.append(f'    <line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" stroke="#000" stroke-width="2" />')
-            elif entity.type == "circle" and entity.center and entity.radius:
-                cx, cy = world_to_svg(entity.center[0], entity.center[1])
-                r = entity.radius * scale
-                svg_lines.append(f'    <circle cx="{cx:.2f}" cy="{cy:.2f}" r="{r:.2f}" stroke="#000" stroke-width="2" fill="none" />')
-            elif entity.type == "rectangle" and entity.corner1 and entity.corner2:
-                x1, y1 = world_to_svg(entity.corner1[0], entity.corner1[1])
-                x2, y2 = world_to_svg(entity.corner2[0], entity.corner2[1])
-                # Ensure x1 < x2 and y1 < y2 for rectangle
-                rect_x = min(x1, x2)
-                rect_y = min(y1, y2)
-                rect_width = abs(x2 - x1)
-                rect_height = abs(y2 - y1)
-                svg_lines.append(f'    <rect x="{rect_x:.2f}" y="{rect_y:.2f}" width="{rect_width:.2f}" height="{rect_height:.2f}" stroke="#000" stroke-width="2" fill="none" />')
-    
-    svg_lines.append('  </g>')
-    svg_lines.append('  <g id="dimensions">')
+    buf = io.StringIO()
+    write = buf.write
+    write(
+        f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">\n'
+        '  <defs>\n'
+        '    <marker id="arrowhead" markerWidth="10" markerHeight="10" refX="9" refY="3" orient="auto">\n'
+        '      <polygon points="0 0, 10 3, 0 6" fill="#333" />\n'
+        '    </marker>\n'
+        '  </defs>\n'
+        '  <g id="geometry">\n'
+    )
+    
+    # Draw entities (points are consumed from svg_pts in collection order)
+    i = 0
+    for entity in drawables:
+        if entity.type == "line":
+            (x1, y1), (x2, y2) = svg_pts[i], svg_pts[i + 1]
+            i += 2
+            write(_LINE_TEMPLATE % (x1, y1, x2, y2))
+        elif entity.type == "circle":
+            cx, cy = svg_pts[i]
+            i += 1
+            write(_CIRCLE_TEMPLATE % (cx, cy, entity.radius * scale))
+        else:
+            (x1, y1), (x2, y2) = svg_pts[i], svg_pts[i + 1]
+            i += 2
+            # Ensure x1 < x2 and y1 < y2 for rectangle
+            write(_RECT_TEMPLATE % (min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1)))
+    
+    write('  </g>\n')
+    write('  <g id="dimensions">\n')
     
     # Draw dimensions
     for sketch in all_sketches:
+        if not sketch.dimensions:
+            continue
+        entities_by_id = {e.id: e for e in sketch.entities}
         for dimension in sketch.dimensions:
             if dimension.type == "length":
                 # Find the entity
                 entity_id = dimension.entity_ids[0]
-                entity = next((e for e in sketch.entities if e.id == entity_id), None)
+                entity = entities_by_id.get(entity_id)
                 if entity and entity.type == "line" and entity.start and entity.end:
                     x1, y1 = world_to_svg(entity.start[0], entity.start[1])
                     x2, y2 = world_to_svg(entity.end[0], entity.end[1])
@@ -144,29 +167,32 @@ def generate_front_view_svg(part: Part, width: int = 800, height: int = 600) ->
                     # Draw dimension line perpendicular to entity
                     dx = x2 - x1
                     dy = y2 - y1
-                    length = (dx**2 + dy**2)**0.5
+                    length = math.hypot(dx, dy)
                     if length > 0:
                         perp_x = -dy / length * 30
                         perp_y = dx / length * 30
                         dim_x = mid_x + perp_x
                         dim_y = mid_y + perp_y
                         
-                        svg_lines.append(f'    <line x1="{mid_x:.2f}" y1="{mid_y:.2f}" x2="{dim_x:.2f}" y2="{dim_y:.2f}" stroke="#0066cc" stroke-width="1" />')
-                        svg_lines.append(f'    <text x="{dim_x + 5:.2f}" y="{dim_y + 5:.2f}" fill="#0066cc" font-size="12">{dimension.value} {dimension.unit}</text>')
+                        write(_LENGTH_DIM_TEMPLATE % (
+                            mid_x, mid_y, dim_x, dim_y,
+                            dim_x + 5, dim_y + 5, dimension.value, dimension.unit,
+                        ))
             elif dimension.type == "diameter":
                 # Find the entity
                 entity_id = dimension.entity_ids[0]
-                entity = next((e for e in sketch.entities if e.id == entity_id), None)
+                entity = entities_by_id.get(entity_id)
                 if entity and entity.type == "circle" and entity.center and entity.radius:
                     cx, cy = world_to_svg(entity.center[0], entity.center[1])
                     r = entity.radius * scale
                     
                     # Draw diameter dimension
-                    svg_lines.append(f'    <line x1="{cx - r - 20:.2f}" y1="{cy:.2f}" x2="{cx + r + 20:.2f}" y2="{cy:.2f}" stroke="#0066cc" stroke-width="1" marker-end="url(#arrowhead)" marker-start="url(#arrowhead)" />')
-                    svg_lines.append(f'    <text x="{cx:.2f}" y="{cy - 10:.2f}" text-anchor="middle" fill="#0066cc" font-size="12">⌀{dimension.value} {dimension.unit}</text>')
+                    write(_DIAMETER_DIM_TEMPLATE % (
+                        cx - r - 20, cy, cx + r + 20, cy,
+                        cx, cy - 10, dimension.value, dimension.unit,
+                    ))
     
-    svg_lines.append('  </g>')
-    svg_lines.append('</svg>')
+    write('  </g>\n')
+    write('</svg>')
     
-    return '\n'.join(svg_lines)
-
+    return buf.getvalue()
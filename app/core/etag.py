@@ -0,0 +1,81 @@
+"""
+ETag support for idempotent POST endpoints.
+
+Build and mesh endpoints take their whole input in the request body, and for
+a given service build their responses are pure functions of it. Hashing the
+body together with the versions of the code producing the response gives a
+valid entity tag. Clients that poll with an unchanged body can send it back
+in If-None-Match and get an empty 304 instead of a re-encoded mesh.
+"""
+
+import hashlib
+
+import cadquery as cq
+import OCP
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.ir import Part
+from app.core.build_cache import part_cache_key
+
+
+# Bump whenever build/mesh output for an unchanged request body changes
+# (welding, vertex order, LODs, ...), so tags held by clients stop matching
+RESPONSE_FORMAT_VERSION = "1"
+
+
+def _version_tag() -> bytes:
+    """Versions the responses depend on besides the body (fixed for the process lifetime)."""
+    occ_version = getattr(OCP, "__version__", "unknown")
+    return f"{RESPONSE_FORMAT_VERSION}|{cq.__version__}|{occ_version}".encode()
+
+
+_VERSION_TAG = _version_tag()
+
+
+def request_etag(http_request: Request, body: BaseModel, part: Part) -> str:
+    """
+    Compute the entity tag for a request.
+
+    The part is hashed by its part_cache_key, i.e. from the validated Part
+    rather than the raw part_ir dict, so equivalent IRs (key order, 10 vs
+    10.0) share a tag. The other body fields are typed and hashed as dumped.
+    The response format and CadQuery/OCC versions are hashed too, so a
+    deployment that changes the output does not answer old tags with 304.
+
+    Args:
+        http_request: Incoming request (its path is part of the tag)
+        body: Validated request body with a part_ir field
+        part: Part validated from body.part_ir
+
+    Returns:
+        Quoted strong entity tag
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(_VERSION_TAG)
+    hasher.update(http_request.url.path.encode())
+    hasher.update(part_cache_key(part).encode())
+    hasher.update(body.model_dump_json(exclude={"part_ir"}).encode())
+    return f'"{hasher.hexdigest()}"'
+
+
+def not_modified(http_request: Request, etag: str) -> Response | None:
+    """
+    Build a 304 response if the request's If-None-Match matches the tag.
+
+    Args:
+        http_request: Incoming request
+        etag: Entity tag of the response that would be produced
+
+    Returns:
+        Empty 304 response, or None if the full response must be sent
+    """
+    if_none_match = http_request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    # Weak comparison, as for If-None-Match on GET
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates or etag in candidates:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
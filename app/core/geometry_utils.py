@@ -2,8 +2,143 @@
 Geometry utility functions for bounding box, topology, and mass property calculations.
 """
 
+import threading
+from collections import OrderedDict
+
 import cadquery as cq
-from typing import Optional
+import numpy as np
+from typing import Any, Optional
+
+
+# Maximum number of individual TINY_FACE issues reported by validate_geometry
+MAX_TINY_FACE_ISSUES = 10
+
+# Attribute used to memoize tessellation results on a solid instance.
+# Solids may live on in the build cache, so each keeps only its most recently
+# used tolerances: clients can send arbitrary ones (e.g. from a slider).
+_TESS_CACHE_ATTR = "_eidos_tessellation_cache"
+TESS_CACHE_SIZE = 4
+
+# Attribute used to memoize face bounding boxes on a shape (see face_bounding_boxes)
+_FACE_BOXES_ATTR = "_eidos_face_boxes"
+
+# Attribute holding the per-shape meshing lock (see shape_lock)
+_SHAPE_LOCK_ATTR = "_eidos_shape_lock"
+_shape_lock_guard = threading.Lock()
+
+
+def shape_lock(shape: cq.Shape) -> threading.Lock:
+    """
+    Get the lock serializing operations that write state onto a shape.
+    
+    OCC stores triangulations on the shape itself, so tessellation must not
+    run concurrently on a shape shared between worker threads (e.g. one
+    served from the build cache). The same holds for state memoized on the
+    shape, such as the builder's "to_next" ray intersector.
+    
+    Args:
+        shape: CadQuery Shape
+        
+    Returns:
+        Lock owned by the shape
+    """
+    lock = getattr(shape, _SHAPE_LOCK_ATTR, None)
+    if lock is None:
+        with _shape_lock_guard:
+            lock = getattr(shape, _SHAPE_LOCK_ATTR, None)
+            if lock is None:
+                lock = threading.Lock()
+                setattr(shape, _SHAPE_LOCK_ATTR, lock)
+    return lock
+
+
+def tessellate_cached(solid: cq.Shape, tolerance: float = 0.1) -> tuple[list[Any], list[Any]]:
+    """
+    Tessellate a solid, reusing a recent result for the same tolerance.
+    
+    ``Shape.tessellate`` keeps any triangulation already stored on the shape
+    that is at least as fine as requested, so a cache miss first clears it:
+    the result then depends only on the tolerance it is memoized under, not
+    on earlier meshing or STL export of the shape.
+    
+    The returned lists are shared between callers and must not be mutated.
+    
+    Args:
+        solid: CadQuery Shape to tessellate
+        tolerance: Linear tessellation tolerance
+        
+    Returns:
+        (vertices, triangles) tuple as returned by ``Shape.tessellate``
+    """
+    with shape_lock(solid):
+        cache = getattr(solid, _TESS_CACHE_ATTR, None)
+        if cache is None:
+            cache = OrderedDict()
+            setattr(solid, _TESS_CACHE_ATTR, cache)
+        
+        if tolerance not in cache:
+            from OCP.BRepTools import BRepTools
+            
+            BRepTools.Clean_s(solid.wrapped)
+            cache[tolerance] = solid.tessellate(tolerance)
+            while len(cache) > TESS_CACHE_SIZE:
+                cache.popitem(last=False)
+        cache.move_to_end(tolerance)
+        return cache[tolerance]
+
+
+def face_bounding_boxes(shape: cq.Shape) -> tuple[list[cq.Face], np.ndarray]:
+    """
+    Get a shape's faces with their axis-aligned bounding boxes.
+    
+    Boxes come from the exact geometry rather than any stored triangulation,
+    so they always enclose the face. The result is memoized on the shape and
+    must not be mutated.
+    
+    Args:
+        shape: CadQuery Shape
+        
+    Returns:
+        Tuple of (faces, (F, 2, 3) array of [min, max] corners per face)
+    """
+    cached = getattr(shape, _FACE_BOXES_ATTR, None)
+    if cached is None:
+        from OCP.Bnd import Bnd_Box
+        from OCP.BRepBndLib import BRepBndLib
+        
+        faces = shape.Faces()
+        boxes = np.empty((len(faces), 2, 3), dtype=np.float64)
+        for i, face in enumerate(faces):
+            box = Bnd_Box()
+            BRepBndLib.Add_s(face.wrapped, box, False)
+            boxes[i] = np.reshape(box.Get(), (2, 3))
+        # Concurrent first calls compute the same value; either may win
+        cached = (faces, boxes)
+        setattr(shape, _FACE_BOXES_ATTR, cached)
+    return cached
+
+
+def exact_bounding_box(shape: cq.Shape) -> cq.BoundBox:
+    """
+    Get the bounding box of a shape from its exact geometry.
+    
+    ``Shape.BoundingBox`` uses any triangulation stored on the faces, padded
+    by its deflection, so on a shape that has been meshed (e.g. a cached,
+    shared solid) the box would depend on earlier requests. Ignoring the
+    triangulation also makes this safe while another thread remeshes the shape.
+    
+    Args:
+        shape: CadQuery Shape
+        
+    Returns:
+        CadQuery BoundBox
+    """
+    from OCP.Bnd import Bnd_Box
+    from OCP.BRepBndLib import BRepBndLib
+    
+    box = Bnd_Box()
+    BRepBndLib.AddOptimal_s(shape.wrapped, box, False, False)
+    return cq.BoundBox(box)
 
 
 def calculate_bounding_box(solid: cq.Solid) -> dict[str, list[float]]:
@@ -16,8 +151,8 @@ def calculate_bounding_box(solid: cq.Solid) -> dict[str, list[float]]:
     Returns:
         Dict with 'min' and 'max' keys, each containing [x, y, z] coordinates
     """
-    # Get bounding box from CadQuery solid
-    bbox = solid.BoundingBox()
+    # Exact box: independent of any mesh stored on the (possibly cached) solid
+    bbox = exact_bounding_box(solid)
     
     return {
         "min": [bbox.xmin, bbox.ymin, bbox.zmin],
@@ -25,6 +160,35 @@ def calculate_bounding_box(solid: cq.Solid) -> dict[str, list[float]]:
     }
 
 
+def topology_summary_from_shape(shape: Any) -> dict[str, int]:
+    """
+    Count faces, edges and vertices of a raw OCC shape.
+    
+    Args:
+        shape: OCC TopoDS_Shape (e.g. ``solid.wrapped``)
+        
+    Returns:
+        Dict with face_count, edge_count, vertex_count
+    """
+    from OCP.TopExp import TopExp_Explorer
+    from OCP.TopAbs import TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX
+    
+    counts = []
+    for shape_type in (TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX):
+        count = 0
+        explorer = TopExp_Explorer(shape, shape_type)
+        while explorer.More():
+            count += 1
+            explorer.Next()
+        counts.append(count)
+    
+    return {
+        "face_count": counts[0],
+        "edge_count": counts[1],
+        "vertex_count": counts[2]
+    }
+
+
 def get_topology_summary(solid: cq.Solid) -> dict[str, int]:
     """
     Get topology summary (face, edge, vertex counts) from a solid.
@@ -39,45 +203,12 @@ def get_topology_summary(solid: cq.Solid) -> dict[str, int]:
     try:
         # CadQuery solid wraps OCC TopoDS_Shape
         # We can get topology information from the underlying OCC object
-        occ_shape = solid.wrapped
-        
-        # Count faces
-        from OCP.TopTools import TopTools_ListOfShape
-        from OCP.TopExp import TopExp_Explorer
-        from OCP.TopAbs import TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX
-        
-        face_count = 0
-        edge_count = 0
-        vertex_count = 0
-        
-        # Count faces
-        face_exp = TopExp_Explorer(occ_shape, TopAbs_FACE)
-        while face_exp.More():
-            face_count += 1
-            face_exp.Next()
-        
-        # Count edges
-        edge_exp = TopExp_Explorer(occ_shape, TopAbs_EDGE)
-        while edge_exp.More():
-            edge_count += 1
-            edge_exp.Next()
-        
-        # Count vertices
-        vertex_exp = TopExp_Explorer(occ_shape, TopAbs_VERTEX)
-        while vertex_exp.More():
-            vertex_count += 1
-            vertex_exp.Next()
-        
-        return {
-            "face_count": face_count,
-            "edge_count": edge_count,
-            "vertex_count": vertex_count
-        }
+        return topology_summary_from_shape(solid.wrapped)
     except Exception as e:
         # Fallback: use tessellation to estimate
         # This is less accurate but works if OCC access fails
         try:
-            mesh = solid.tessellate(0.1)
+            mesh = tessellate_cached(solid, 0.1)
             vertices = mesh[0]
             faces = mesh[1]
             
@@ -98,87 +229,98 @@ def get_topology_summary(solid: cq.Solid) -> dict[str, int]:
             }
 
 
-def calculate_mass_properties(solid: cq.Solid, density: Optional[float] = None) -> dict:
+def _default_mass_properties() -> dict:
+    """Zeroed mass properties returned when computation fails."""
+    return {
+        "volume": 0.0,
+        "area": 0.0,
+        "center_of_mass": [0.0, 0.0, 0.0],
+        "principal_moments": [0.0, 0.0, 0.0],
+        "principal_axes": [
+            [1.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.0, 0.0, 1.0]
+        ]
+    }
+
+
+def mass_properties_from_shape(shape: Any, density: Optional[float] = None) -> dict:
     """
-    Calculate mass properties of a solid.
+    Calculate mass properties of a raw OCC shape.
+    
+    Volume, center of mass and the inertia tensor all come from a single
+    volume integration pass; area needs one surface pass.
     
     Args:
-        solid: CadQuery Solid object
+        shape: OCC TopoDS_Shape (e.g. ``solid.wrapped``)
         density: Material density in kg/m³ (optional)
         
     Returns:
         Dict with volume, area, center_of_mass, principal_moments, principal_axes
     """
+    from OCP.GProp import GProp_GProps
+    from OCP.BRepGProp import BRepGProp
+    
+    volume_props = GProp_GProps()
+    BRepGProp.VolumeProperties_s(shape, volume_props)
+    surface_props = GProp_GProps()
+    BRepGProp.SurfaceProperties_s(shape, surface_props)
+    
+    # Convert mm³/mm² (CadQuery uses mm) to m³ and m²
+    volume_m3 = volume_props.Mass() / 1e9
+    area_m2 = surface_props.Mass() / 1e6
+    
+    # Get center of mass
+    com = volume_props.CentreOfMass()
+    center_of_mass = [com.X() / 1000, com.Y() / 1000, com.Z() / 1000]  # Convert mm to m
+    
     try:
-        # Get volume and surface area
-        volume = solid.Volume()  # in mm³ (CadQuery uses mm)
-        area = solid.Area()  # in mm²
-        
-        # Convert to m³ and m²
-        volume_m3 = volume / 1e9
-        area_m2 = area / 1e6
+        # Get inertia matrix (about the center of mass)
+        inertia = volume_props.MatrixOfInertia()
+        tensor = np.array(
+            [[inertia.Value(i, j) for j in (1, 2, 3)] for i in (1, 2, 3)]
+        ) / 1e9  # Convert to kg·m²
         
-        # Get center of mass
-        com = solid.CenterOfMass()
-        center_of_mass = [com.x / 1000, com.y / 1000, com.z / 1000]  # Convert mm to m
+        # Symmetric 3x3: eigenvalues are the principal moments (ascending),
+        # eigenvectors (columns) the principal axes
+        moments, axes = np.linalg.eigh(tensor)
+        if np.linalg.det(axes) < 0:
+            # Keep a right-handed frame
+            axes[:, 2] = -axes[:, 2]
         
-        # For principal moments and axes, we need to use OCC's GProp_GProps
-        # This is a simplified version - full implementation would use OCC's inertia properties
-        try:
-            from OCP.GProp import GProp_GProps
-            from OCP.BRepGProp import BRepGProp
-            
-            props = GProp_GProps()
-            BRepGProp.VolumeProperties_s(solid.wrapped, props)
-            
-            # Get inertia matrix
-            inertia = props.MatrixOfInertia()
-            
-            # For MVP, return simplified principal moments
-            # Full implementation would diagonalize the inertia matrix
-            # For now, return diagonal elements as approximation
-            principal_moments = [
-                inertia.Value(1, 1) / 1e9,  # Convert to kg·m²
-                inertia.Value(2, 2) / 1e9,
-                inertia.Value(3, 3) / 1e9
-            ]
-            
-            # Principal axes would be eigenvectors of inertia matrix
-            # For MVP, return identity matrix as placeholder
-            principal_axes = [
-                [1.0, 0.0, 0.0],
-                [0.0, 1.0, 0.0],
-                [0.0, 0.0, 1.0]
-            ]
-        except Exception:
-            # Fallback: return zeros for principal moments/axes
-            principal_moments = [0.0, 0.0, 0.0]
-            principal_axes = [
-                [1.0, 0.0, 0.0],
-                [0.0, 1.0, 0.0],
-                [0.0, 0.0, 1.0]
-            ]
+        principal_moments = moments.tolist()
+        principal_axes = axes.T.tolist()
+    except Exception:
+        # Fallback: return zeros for principal moments/axes
+        defaults = _default_mass_properties()
+        principal_moments = defaults["principal_moments"]
+        principal_axes = defaults["principal_axes"]
+    
+    return {
+        "volume": volume_m3,
+        "area": area_m2,
+        "center_of_mass": center_of_mass,
+        "principal_moments": principal_moments,
+        "principal_axes": principal_axes
+    }
+
+
+def calculate_mass_properties(solid: cq.Solid, density: Optional[float] = None) -> dict:
+    """
+    Calculate mass properties of a solid.
+    
+    Args:
+        solid: CadQuery Solid object
+        density: Material density in kg/m³ (optional)
         
-        return {
-            "volume": volume_m3,
-            "area": area_m2,
-            "center_of_mass": center_of_mass,
-            "principal_moments": principal_moments,
-            "principal_axes": principal_axes
-        }
+    Returns:
+        Dict with volume, area, center_of_mass, principal_moments, principal_axes
+    """
+    try:
+        return mass_properties_from_shape(solid.wrapped, density)
     except Exception as e:
         # Return zeros on error
-        return {
-            "volume": 0.0,
-            "area": 0.0,
-            "center_of_mass": [0.0, 0.0, 0.0],
-            "principal_moments": [0.0, 0.0, 0.0],
-            "principal_axes": [
-                [1.0, 0.0, 0.0],
-                [0.0, 1.0, 0.0],
-                [0.0, 0.0, 1.0]
-            ]
-        }
+        return _default_mass_properties()
 
 
 def validate_geometry(solid: cq.Solid) -> tuple[bool, list[dict]]:
@@ -235,6 +377,7 @@ def validate_geometry(solid: cq.Solid) -> tuple[bool, list[dict]]:
             from OCP.BRepGProp import BRepGProp
             from OCP.GProp import GProp_GProps
             
+            tiny_count = 0
             face_exp = TopExp_Explorer(solid.wrapped, TopAbs_FACE)
             while face_exp.More():
                 face = face_exp.Current()
@@ -243,13 +386,23 @@ def validate_geometry(solid: cq.Solid) -> tuple[bool, list[dict]]:
                 area = props.Mass()
                 
                 if area < 1e-6:  # Very small face (1e-6 mm²)
-                    issues.append({
-                        "code": "TINY_FACE",
-                        "message": f"Face with very small area: {area} mm²",
-                        "severity": "warning"
-                    })
+                    tiny_count += 1
+                    if tiny_count <= MAX_TINY_FACE_ISSUES:
+                        issues.append({
+                            "code": "TINY_FACE",
+                            "message": f"Face with very small area: {area} mm²",
+                            "severity": "warning"
+                        })
                 
                 face_exp.Next()
+            
+            if tiny_count > MAX_TINY_FACE_ISSUES:
+                # Collapse the remainder into one summary entry
+                issues.append({
+                    "code": "TINY_FACE",
+                    "message": f"{tiny_count - MAX_TINY_FACE_ISSUES} more faces with very small area ({tiny_count} total)",
+                    "severity": "warning"
+                })
         except Exception:
             pass  # Skip if check fails
         
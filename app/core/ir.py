@@ -7,7 +7,7 @@ and used to build geometry and perform analyses.
 """
 
 from typing import Literal, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 
 
 class Param(BaseModel):
@@ -188,6 +188,9 @@ class Sketch(BaseModel):
         default_factory=list,
         description="Detected closed profiles (outer boundary and holes). Auto-detected if not provided."
     )
+    
+    # Set once profile detection has run, so an empty result is not recomputed
+    _profiles_detected: bool = PrivateAttr(default=False)
 
 
 class Part(BaseModel):
@@ -212,3 +215,6 @@ class Part(BaseModel):
     )
     sketches: list[Sketch] = Field(default_factory=list, description="2D sketches (can also be embedded in sketch features)")
 
+
+# Prebuilt adapter for validating Part IR payloads in request handlers
+PART_ADAPTER = TypeAdapter(Part)
@@ -0,0 +1,180 @@
+"""
+Mesh post-processing utilities.
+"""
+
+import numpy as np
+
+
+def _unique_rows(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Group identical rows of an (N, 3) integer key array.
+
+    Equivalent to ``np.unique(keys, axis=0, return_index=True,
+    return_inverse=True, return_counts=True)`` without the unique rows
+    themselves, but sorts the three int64 columns with lexsort instead of
+    comparing rows as opaque byte strings (about 3x faster on large meshes).
+
+    Returns:
+        Tuple of (first index of each group, group of each row, group sizes),
+        with groups in lexicographic key order
+    """
+    order = np.lexsort((keys[:, 2], keys[:, 1], keys[:, 0]))
+    sorted_keys = keys[order]
+    starts = np.empty(len(keys), dtype=bool)
+    starts[0] = True
+    np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1, out=starts[1:])
+
+    inverse = np.empty(len(keys), dtype=np.int64)
+    inverse[order] = np.cumsum(starts) - 1
+    # lexsort is stable, so each group's first sorted row is its first occurrence
+    boundaries = np.flatnonzero(starts)
+    counts = np.diff(np.append(boundaries, len(keys)))
+    return order[boundaries], inverse, counts
+
+
+def weld_vertices(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    decimals: int = 5
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merge coincident vertices of a triangle mesh.
+
+    OCC tessellates each B-rep face separately, so vertices on shared edges
+    are emitted once per face. Coordinates are quantized before matching so
+    floating-point noise does not keep coincident vertices apart.
+
+    Args:
+        vertices: (N, 3) vertex array
+        faces: (M, 3) triangle index array
+        decimals: Decimal places coordinates are rounded to for matching
+
+    Returns:
+        Tuple of (K, 3) unique vertices and (M, 3) remapped triangle indices
+    """
+    if len(vertices) == 0:
+        return vertices, faces
+
+    quantized = np.round(vertices * 10.0 ** decimals).astype(np.int64)
+    first, inverse, _ = _unique_rows(quantized)
+
+    # inverse maps each original vertex to its unique row
+    return vertices[first], inverse[faces].astype(faces.dtype)
+
+
+def cluster_vertices(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    cell_size: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simplify a triangle mesh by vertex clustering.
+
+    Vertices are snapped to a uniform grid and each occupied cell is replaced
+    by the mean of its vertices; triangles that collapse are dropped. Every
+    vertex moves by less than one cell diagonal, so the cell size acts like a
+    tessellation tolerance for a coarser level of detail.
+
+    Args:
+        vertices: (N, 3) vertex array
+        faces: (M, 3) triangle index array
+        cell_size: Grid cell edge length
+
+    Returns:
+        Tuple of (K, 3) cluster vertices and (L, 3) remaining triangles
+    """
+    if len(vertices) == 0:
+        return vertices, faces
+
+    cells = np.floor(vertices / cell_size).astype(np.int64)
+    _, inverse, counts = _unique_rows(cells)
+
+    # Cluster representative: centroid of its vertices
+    sums = np.zeros((len(counts), 3), dtype=np.float64)
+    np.add.at(sums, inverse, vertices)
+    clustered = (sums / counts[:, None]).astype(vertices.dtype)
+
+    remapped = inverse[faces]
+    keep = (
+        (remapped[:, 0] != remapped[:, 1])
+        & (remapped[:, 1] != remapped[:, 2])
+        & (remapped[:, 0] != remapped[:, 2])
+    )
+    remapped = remapped[keep]
+
+    # Drop clusters only referenced by collapsed triangles
+    used, compact = np.unique(remapped, return_inverse=True)
+    return clustered[used], compact.reshape(-1, 3).astype(faces.dtype)
+
+
+def optimize_vertex_fetch(vertices: np.ndarray, faces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reorder vertices into the order triangles first reference them.
+
+    Welding and clustering order vertices by position, which scatters the
+    vertices of neighbouring triangles across the buffer. Renumbering by first
+    use makes GPU vertex fetches mostly sequential. Unreferenced vertices are
+    dropped; triangle order is unchanged.
+
+    Args:
+        vertices: (N, 3) vertex array
+        faces: (M, 3) triangle index array
+
+    Returns:
+        Tuple of (K, 3) reordered vertices and (M, 3) remapped triangle indices
+    """
+    if len(faces) == 0:
+        return vertices[:0], faces
+
+    used, first = np.unique(faces.reshape(-1), return_index=True)
+    order = used[np.argsort(first, kind="stable")]
+    remap = np.empty(len(vertices), dtype=faces.dtype)
+    remap[order] = np.arange(len(order), dtype=faces.dtype)
+    return vertices[order], remap[faces]
+
+
+def quantize_vertices(vertices: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Quantize vertex positions to uint16 over the mesh's bounding box.
+
+    Each axis is mapped linearly onto [0, 65535]; positions are recovered as
+    ``q * scale + offset``. The error is at most half a step, i.e.
+    (bbox extent / 65535) / 2 per axis.
+
+    Args:
+        vertices: (N, 3) vertex array
+
+    Returns:
+        Tuple of (N, 3) uint16 positions, per-axis offset and per-axis scale
+    """
+    if len(vertices) == 0:
+        return np.empty((0, 3), dtype=np.uint16), np.zeros(3), np.ones(3)
+
+    offset = vertices.min(axis=0)
+    extent = vertices.max(axis=0) - offset
+    # Flat axes (e.g. a planar mesh) quantize to 0 with any non-zero scale
+    scale = np.where(extent > 0, extent / 65535.0, 1.0)
+    quantized = np.round((vertices - offset) / scale).astype(np.uint16)
+    return quantized, offset, scale
+
+
+def pack_mesh(vertices: np.ndarray, faces: np.ndarray) -> bytes:
+    """
+    Pack a triangle mesh into one binary buffer.
+
+    The layout is little-endian vertices (N*3 values; float32, or uint16 for
+    quantized positions) followed by uint32 triangle indices (M*3 values).
+    The index section is padded to a 4-byte offset, so a client can view
+    both sections directly as typed arrays.
+
+    Args:
+        vertices: (N, 3) vertex array (uint16 arrays are packed as-is)
+        faces: (M, 3) triangle index array
+
+    Returns:
+        Packed mesh bytes
+    """
+    dtype = "<u2" if vertices.dtype == np.uint16 else "<f4"
+    vertex_bytes = np.ascontiguousarray(vertices, dtype=dtype).tobytes()
+    padding = b"\0" * (-len(vertex_bytes) % 4)
+    return vertex_bytes + padding + np.ascontiguousarray(faces, dtype="<u4").tobytes()
@@ -5,118 +5,168 @@ Detects closed profiles (outer boundaries and holes) from sketch entities.
 This enables proper boolean operations (extrude with holes).
 """
 
-from typing import Optional
+import functools
+from typing import NamedTuple, Optional
 from app.core.ir import Sketch, SketchEntity, Profile
 import math
+import numpy as np
 
 
 def calculate_entity_area(entity: SketchEntity) -> float:
     """Calculate the area enclosed by an entity (for circles and rectangles)."""
     if entity.type == "circle" and entity.center and entity.radius:
-        return math.pi * entity.radius * entity.radius
+        return _circle_area(entity.radius)
     elif entity.type == "rectangle" and entity.corner1 and entity.corner2:
-        c1 = entity.corner1
-        c2 = entity.corner2
-        width = abs(c2[0] - c1[0])
-        height = abs(c2[1] - c1[1])
-        return width * height
+        return _rectangle_area(entity.corner1, entity.corner2)
     return 0.0
 
 
+@functools.lru_cache(maxsize=4096)
+def _circle_area(radius: float) -> float:
+    """Area of a circle (cached by radius)."""
+    return math.pi * radius * radius
+
+
+@functools.lru_cache(maxsize=4096)
+def _rectangle_area(c1: tuple[float, float], c2: tuple[float, float]) -> float:
+    """Area of an axis-aligned rectangle (cached by corner points)."""
+    width = abs(c2[0] - c1[0])
+    height = abs(c2[1] - c1[1])
+    return width * height
+
+
+def _point_key(x: float, y: float) -> int:
+    """
+    Pack a point snapped to a 1e-6 grid into a single integer key.
+    
+    Equivalent to keying on ``(round(x, 6), round(y, 6))`` without float
+    rounding or tuple hashing; y is stored in the low 64 bits (two's complement).
+    """
+    return (round(x * 1_000_000) << 64) | (round(y * 1_000_000) & 0xFFFF_FFFF_FFFF_FFFF)
+
+
 def find_closed_loops(entities: list[SketchEntity]) -> list[list[str]]:
     """
     Find closed loops from line entities by following connected endpoints.
     
     Returns a list of loops, where each loop is a list of entity IDs in order.
     """
-    if not entities:
-        return []
+    lines, loops, _ = _find_loops(entities)
+    return [[lines[i].id for i in loop] for loop in loops]
+
+
+def _find_loops(entities: list[SketchEntity]) -> tuple[list[SketchEntity], list[list[int]], np.ndarray]:
+    """
+    Find closed loops, reading every line endpoint exactly once.
     
-    # Build adjacency map: point -> list of entities connected at that point
-    point_to_entities: dict[tuple[float, float], list[tuple[str, bool]]] = {}
-    # bool indicates if point is start (True) or end (False) of the entity
-    
-    for entity in entities:
-        if entity.type == "line" and entity.start and entity.end:
-            start = (round(entity.start[0], 6), round(entity.start[1], 6))
-            end = (round(entity.end[0], 6), round(entity.end[1], 6))
-            
-            if start not in point_to_entities:
-                point_to_entities[start] = []
-            if end not in point_to_entities:
-                point_to_entities[end] = []
-            
-            point_to_entities[start].append((entity.id, True))
-            point_to_entities[end].append((entity.id, False))
+    Returns:
+        Tuple of (lines, loops, coords): the line entities that have both
+        endpoints, each loop as a list of indices into lines, and an (N, 4)
+        float64 array of [start_x, start_y, end_x, end_y] per line
+    """
+    lines = [e for e in entities if e.type == "line" and e.start and e.end]
+    
+    # Intern snapped endpoints as integer point ids, so the walk compares ints
+    # instead of rebuilding and hashing rounded tuples at every step.
+    # Endpoint k belongs to line k // 2 and is its start if k is even.
+    # Raw coordinates are captured in the same pass for the loop bounding boxes.
+    point_ids: dict[int, int] = {}
+    endpoint_pids: list[int] = []
+    flat_coords: list[float] = []
+    for entity in lines:
+        for x, y in (entity.start, entity.end):
+            flat_coords.append(x)
+            flat_coords.append(y)
+            key = _point_key(x, y)
+            pid = point_ids.get(key)
+            if pid is None:
+                pid = point_ids[key] = len(point_ids)
+            endpoint_pids.append(pid)
+    coords = np.array(flat_coords, dtype=np.float64).reshape(-1, 4)
+    
+    # Flat CSR adjacency: the endpoints touching point p are
+    # indices[indptr[p]:indptr[p + 1]], in insertion order
+    pids = np.asarray(endpoint_pids, dtype=np.intp)
+    order = np.argsort(pids, kind="stable")
+    indptr = np.zeros(len(point_ids) + 1, dtype=np.intp)
+    np.cumsum(np.bincount(pids, minlength=len(point_ids)), out=indptr[1:])
+    adjacency = _LoopAdjacency(
+        indptr=indptr.tolist(),
+        indices=(order // 2).tolist(),
+        is_start=(order % 2 == 0).tolist(),
+        start_pids=endpoint_pids[0::2],
+        end_pids=endpoint_pids[1::2]
+    )
     
     # Find closed loops by following connected lines
-    loops: list[list[str]] = []
-    used_entities = set()
+    loops: list[list[int]] = []
+    used = [False] * len(lines)
+    max_iterations = len(entities)  # Prevent infinite loops
     
-    for start_entity in entities:
-        if start_entity.type != "line" or start_entity.id in used_entities:
-            continue
-        if not start_entity.start or not start_entity.end:
+    for line_idx in range(len(lines)):
+        if used[line_idx]:
             continue
         
         # Try to find a loop starting from this entity
-        loop = _find_loop_from_entity(start_entity, entities, point_to_entities, used_entities)
+        loop = _walk_loop(line_idx, adjacency, used, max_iterations)
         if loop and len(loop) >= 3:  # At least 3 entities for a closed loop
             loops.append(loop)
-            used_entities.update(loop)
+            for i in loop:
+                used[i] = True
     
-    return loops
+    return lines, loops, coords
 
 
-def _find_loop_from_entity(
-    start_entity: SketchEntity,
-    all_entities: list[SketchEntity],
-    point_to_entities: dict[tuple[float, float], list[tuple[str, bool]]],
-    used_entities: set[str]
-) -> Optional[list[str]]:
-    """Find a closed loop starting from a given entity."""
-    if not start_entity.start or not start_entity.end:
-        return None
-    
-    entity_map = {e.id: e for e in all_entities}
-    loop = [start_entity.id]
-    current_point = (round(start_entity.end[0], 6), round(start_entity.end[1], 6))
-    start_point = (round(start_entity.start[0], 6), round(start_entity.start[1], 6))
-    max_iterations = len(all_entities)  # Prevent infinite loops
+class _LoopAdjacency(NamedTuple):
+    """Point/line incidence of a sketch's lines in CSR form (see find_closed_loops)."""
+    indptr: list[int]  # Per point id: offset of its first endpoint in indices
+    indices: list[int]  # Line index of each endpoint, grouped by point
+    is_start: list[bool]  # Whether each endpoint is the start of its line
+    start_pids: list[int]  # Per line: point id of its start
+    end_pids: list[int]  # Per line: point id of its end
+
+
+def _walk_loop(
+    first: int,
+    adjacency: _LoopAdjacency,
+    used: list[bool],
+    max_iterations: int
+) -> Optional[list[int]]:
+    """Find a closed loop starting from a given line index (see find_closed_loops)."""
+    indptr, indices, is_start, start_pids, end_pids = adjacency
+    loop = [first]
+    in_loop = {first}
+    current_point = end_pids[first]
+    start_point = start_pids[first]
     
     for _ in range(max_iterations):
         # Check if we've closed the loop
         if current_point == start_point and len(loop) >= 3:
             return loop
         
-        # Find next entity connected at current point
-        connected = point_to_entities.get(current_point, [])
-        next_entity_id = None
+        # The line we arrived on is one of the endpoints here; with no other
+        # endpoint at this point the walk cannot continue
+        lo, hi = indptr[current_point], indptr[current_point + 1]
+        if hi - lo < 2:
+            return None  # Dead end
         
-        for entity_id, is_start in connected:
-            if entity_id not in loop and entity_id not in used_entities:
-                next_entity_id = entity_id
+        # Find next line connected at current point
+        next_k = -1
+        for k in range(lo, hi):
+            line_idx = indices[k]
+            if line_idx not in in_loop and not used[line_idx]:
+                next_k = k
                 break
         
-        if not next_entity_id:
+        if next_k < 0:
             return None  # Dead end
         
-        next_entity = entity_map.get(next_entity_id)
-        if not next_entity or not next_entity.start or not next_entity.end:
-            return None
-        
-        loop.append(next_entity_id)
+        next_idx = indices[next_k]
+        loop.append(next_idx)
+        in_loop.add(next_idx)
         
-        # Move to the other end of this entity
-        next_start = (round(next_entity.start[0], 6), round(next_entity.start[1], 6))
-        next_end = (round(next_entity.end[0], 6), round(next_entity.end[1], 6))
-        
-        if current_point == next_start:
-            current_point = next_end
-        elif current_point == next_end:
-            current_point = next_start
-        else:
-            return None  # Not connected
+        # Move to the other end of this line
+        current_point = end_pids[next_idx] if is_start[next_k] else start_pids[next_idx]
     
     return None  # Loop too long or not closed
 
@@ -135,43 +185,31 @@ def detect_profiles(sketch: Sketch) -> list[Profile]:
         sketch: The sketch to analyze
         
     Returns:
-        List of detected profiles, with outer boundary first, then holes
+        List of detected profiles, with the outer boundary (largest) first,
+        followed by the remaining profiles in detection order
     """
     profiles: list[Profile] = []
     
-    # Find closed loops from lines
+    # Find closed loops from lines (endpoints are read once, during the walk setup)
     line_entities = [e for e in sketch.entities if e.type == "line"]
-    loops = find_closed_loops(line_entities)
+    lines, loops, coords = _find_loops(line_entities)
     
     for i, loop in enumerate(loops):
         # Calculate approximate area (bounding box area for now)
         # In a full implementation, we'd calculate actual polygon area
-        loop_entities = [e for e in sketch.entities if e.id in loop]
-        if not loop_entities:
-            continue
+        entity_ids = [lines[j].id for j in loop]
         
         # Calculate bounding box area as approximation
-        min_x = min_y = float('inf')
-        max_x = max_y = float('-inf')
-        
-        for entity in loop_entities:
-            if entity.start:
-                min_x = min(min_x, entity.start[0])
-                max_x = max(max_x, entity.start[0])
-                min_y = min(min_y, entity.start[1])
-                max_y = max(max_y, entity.start[1])
-            if entity.end:
-                min_x = min(min_x, entity.end[0])
-                max_x = max(max_x, entity.end[0])
-                min_y = min(min_y, entity.end[1])
-                max_y = max(max_y, entity.end[1])
+        points = coords[loop].reshape(-1, 2)
+        min_x, min_y = points.min(axis=0).tolist()
+        max_x, max_y = points.max(axis=0).tolist()
         
         area = (max_x - min_x) * (max_y - min_y) if max_x > min_x and max_y > min_y else 0.0
         
         profiles.append(Profile(
             id=f"profile_{i}",
             type="outer",  # Will be determined later
-            entity_ids=loop,
+            entity_ids=entity_ids,
             area=area,
             is_outer=True  # Will be determined later
         ))
@@ -191,8 +229,8 @@ def detect_profiles(sketch: Sketch) -> list[Profile]:
     if not profiles:
         return []
     
-    # Sort by area (largest first)
-    profiles.sort(key=lambda p: p.area or 0.0, reverse=True)
+    # Only the largest profile needs to be singled out; the rest keep detection order
+    outer = max(profiles, key=lambda p: p.area or 0.0)
     
     # Determine outer vs holes
     # Largest is outer, others are holes if they're inside it
@@ -201,14 +239,15 @@ def detect_profiles(sketch: Sketch) -> list[Profile]:
     result: list[Profile] = []
     
     if profiles:
-        # First profile (largest) is outer
-        outer = profiles[0]
+        # Largest profile is outer
         outer.type = "outer"
         outer.is_outer = True
         result.append(outer)
         
         # Rest are holes (if they're smaller)
-        for profile in profiles[1:]:
+        for profile in profiles:
+            if profile is outer:
+                continue
             # Simple heuristic: if area is significantly smaller, treat as hole
             # In full implementation, would check geometric containment
             if profile.area and outer.area and profile.area < outer.area * 0.9:
@@ -0,0 +1,37 @@
+"""
+Offloading of blocking CAD kernel work from the event loop.
+
+Route handlers are ``async def``, but CadQuery/OCC builds and analyses are
+synchronous and CPU-bound. Running them directly in a handler blocks the
+event loop and serializes all requests, so they are dispatched to worker
+threads instead (OCC releases the GIL inside most kernel calls).
+"""
+
+import os
+from typing import Any, Callable, TypeVar
+
+import anyio
+
+
+T = TypeVar("T")
+
+# Maximum number of CAD kernel jobs running concurrently
+# Set via: fly secrets set CAD_MAX_WORKERS=4
+CAD_MAX_WORKERS = int(os.getenv("CAD_MAX_WORKERS", str(os.cpu_count() or 4)))
+
+# Caps concurrent kernel jobs; excess requests wait for a free slot
+_cad_limiter = anyio.CapacityLimiter(CAD_MAX_WORKERS)
+
+
+async def run_cad_job(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a blocking CAD function on a worker thread.
+
+    Args:
+        func: Synchronous function doing CadQuery/OCC work
+        *args: Positional arguments for func
+
+    Returns:
+        The function's return value (exceptions propagate to the caller)
+    """
+    return await anyio.to_thread.run_sync(func, *args, limiter=_cad_limiter)
@@ -18,6 +18,27 @@ def pattern_name_dsl(name: str, **params) -> str:
     ...
 """
 
+import numpy as np
+
+
+# DSL templates, parsed once at import; generators only substitute parameters
+_GEAR_TEMPLATE = """  param {n}_module = {m} mm
+  param {n}_teeth = {t}
+  param {n}_width = {w} mm
+  param {n}_pitch_dia = {pd} mm
+  feature {n}_body = cylinder(dia = {n}_pitch_dia, length = {n}_width)"""
+
+_BOLT_CIRCLE_TEMPLATE = """  param {n}_bc_dia = {d} mm
+  param {n}_num_holes = {h}
+  param {n}_hole_dia = {hd} mm
+  param {n}_thickness = {t} mm
+  feature {n}_interface = joint_interface(
+    dia = {n}_bc_dia,
+    hole_dia = {n}_hole_dia,
+    holes = {n}_num_holes,
+    thickness = {n}_thickness
+  )"""
+
 
 def gear_dsl(name: str, module: float, teeth: int, width: float) -> str:
     """
@@ -35,11 +56,7 @@ def gear_dsl(name: str, module: float, teeth: int, width: float) -> str:
     # Placeholder implementation
     # In a full implementation, this would generate proper gear geometry
     pitch_dia = module * teeth
-    return f"""  param {name}_module = {module} mm
-  param {name}_teeth = {teeth}
-  param {name}_width = {width} mm
-  param {name}_pitch_dia = {pitch_dia} mm
-  feature {name}_body = cylinder(dia = {name}_pitch_dia, length = {name}_width)"""
+    return _GEAR_TEMPLATE.format(n=name, m=module, t=teeth, w=width, pd=pitch_dia)
 
 
 def hole_grid_dsl(name: str, rows: int, cols: int, pitch: float, dia: float) -> str:
@@ -56,18 +73,19 @@ def hole_grid_dsl(name: str, rows: int, cols: int, pitch: float, dia: float) ->
     Returns:
         DSL code string
     """
-    lines = []
-    lines.append(f"  param {name}_pitch = {pitch} mm")
-    lines.append(f"  param {name}_hole_dia = {dia} mm")
+    header = f"  param {name}_pitch = {pitch} mm\n  param {name}_hole_dia = {dia} mm"
     
-    for i in range(rows):
-        for j in range(cols):
-            x = j * pitch
-            y = i * pitch
-            hole_name = f"{name}_hole_{i}_{j}"
-            lines.append(f"  feature {hole_name} = hole(dia = {name}_hole_dia, x = {x}, y = {y})")
+    # Row/column offsets are computed in one vectorized op each; a full
+    # meshgrid is unnecessary since every hole just pairs a row with a column
+    xs = list(enumerate((np.arange(cols) * pitch).tolist()))
+    ys = enumerate((np.arange(rows) * pitch).tolist())
+    hole_lines = "\n".join(
+        f"  feature {name}_hole_{i}_{j} = hole(dia = {name}_hole_dia, x = {x}, y = {y})"
+        for i, y in ys
+        for j, x in xs
+    )
     
-    return "\n".join(lines)
+    return f"{header}\n{hole_lines}" if hole_lines else header
 
 
 def bolt_circle_dsl(name: str, dia: float, num_holes: int, hole_dia: float, thickness: float) -> str:
@@ -84,14 +102,5 @@ def bolt_circle_dsl(name: str, dia: float, num_holes: int, hole_dia: float, thic
     Returns:
         DSL code string
     """
-    return f"""  param {name}_bc_dia = {dia} mm
-  param {name}_num_holes = {num_holes}
-  param {name}_hole_dia = {hole_dia} mm
-  param {name}_thickness = {thickness} mm
-  feature {name}_interface = joint_interface(
-    dia = {name}_bc_dia,
-    hole_dia = {name}_hole_dia,
-    holes = {name}_num_holes,
-    thickness = {name}_thickness
-  )"""
+    return _BOLT_CIRCLE_TEMPLATE.format(n=name, d=dia, h=num_holes, hd=hole_dia, t=thickness)
 
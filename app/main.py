@@ -31,6 +31,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read conditional-request and binary mesh headers
+    expose_headers=[
+        "ETag", "X-Vertex-Count", "X-Triangle-Count", "X-Vertex-Offset", "X-Vertex-Scale"
+    ],
 )
 
 # Register geometry service routes (MVP)
@@ -58,7 +62,7 @@ async def root():
         "endpoints": {
             "service": ["/health", "/version"],
             "build": ["/build/solid", "/build/sketch", "/build/feature"],
-            "mesh": ["/mesh/solid", "/section/plane"],
+            "mesh": ["/mesh/solid", "/mesh/solid/binary", "/section/plane"],
             "export": ["/export/step", "/export/stl", "/export/dxf"],
             "import": ["/import/step"],
             "analysis": [
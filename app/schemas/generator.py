@@ -5,12 +5,21 @@ This module generates JSON Schema definitions from Pydantic models
 for use by both Python backend and TypeScript frontend/Supabase edge functions.
 """
 
+import copy
+import functools
 import json
 from pathlib import Path
 from typing import Any
 from pydantic import BaseModel
 
-from app.core.ir import Part, Sketch, Param, Feature, SketchEntity, SketchConstraint, SketchDimension, Profile
+# IR models are imported inside the create_* functions so importing this
+# module does not build their pydantic core schemas up front
+
+
+@functools.lru_cache(maxsize=None)
+def _model_json_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """Build (once per model) the base JSON schema. Callers must not mutate the result."""
+    return model.model_json_schema()
 
 
 def generate_schema_from_model(model: type[BaseModel], schema_id: str, title: str, description: str) -> dict[str, Any]:
@@ -26,8 +35,8 @@ def generate_schema_from_model(model: type[BaseModel], schema_id: str, title: st
     Returns:
         JSON Schema dict
     """
-    # Get the base JSON schema from Pydantic
-    schema = model.model_json_schema()
+    # Get the base JSON schema from Pydantic (cached; copy before adding metadata)
+    schema = copy.deepcopy(_model_json_schema(model))
     
     # Add JSON Schema metadata
     schema["$schema"] = "http://json-schema.org/draft-07/schema#"
@@ -48,6 +57,8 @@ def create_part_ir_schema() -> dict[str, Any]:
     
     Excludes semantic-only fields like chains and constraints.
     """
+    from app.core.ir import Part
+    
     # Create a subset model for PartIR (geometry-focused)
     # We'll generate from the full Part model but document what's included
     schema = generate_schema_from_model(
@@ -65,6 +76,8 @@ def create_part_ir_schema() -> dict[str, Any]:
 
 def create_sketch_ir_schema() -> dict[str, Any]:
     """Create SketchIR schema."""
+    from app.core.ir import Sketch
+    
     return generate_schema_from_model(
         Sketch,
         "sketch_ir",
@@ -73,49 +86,53 @@ def create_sketch_ir_schema() -> dict[str, Any]:
     )
 
 
-def create_mesh_schema() -> dict[str, Any]:
-    """Create mesh response schema."""
-    return {
-        "$schema": "http://json-schema.org/draft-07/schema#",
-        "$id": "https://eidos.cad/schemas/v1/mesh.schema.json",
-        "title": "MeshData",
-        "description": "3D mesh data for rendering (vertices and faces)",
-        "type": "object",
-        "properties": {
-            "vertices": {
+# Mesh response schema (constant; handed out as copies)
+_MESH_SCHEMA: dict[str, Any] = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "$id": "https://eidos.cad/schemas/v1/mesh.schema.json",
+    "title": "MeshData",
+    "description": "3D mesh data for rendering (vertices and faces)",
+    "type": "object",
+    "properties": {
+        "vertices": {
+            "type": "array",
+            "description": "List of vertex coordinates [x, y, z]",
+            "items": {
                 "type": "array",
-                "description": "List of vertex coordinates [x, y, z]",
-                "items": {
-                    "type": "array",
-                    "items": {"type": "number"},
-                    "minItems": 3,
-                    "maxItems": 3
-                }
-            },
-            "faces": {
-                "type": "array",
-                "description": "List of triangular faces as vertex indices [i, j, k]",
-                "items": {
-                    "type": "array",
-                    "items": {"type": "integer"},
-                    "minItems": 3,
-                    "maxItems": 3
-                }
-            },
-            "featureId": {
-                "type": "string",
-                "description": "Optional feature ID for selection mapping"
-            },
-            "faceToFeature": {
+                "items": {"type": "number"},
+                "minItems": 3,
+                "maxItems": 3
+            }
+        },
+        "faces": {
+            "type": "array",
+            "description": "List of triangular faces as vertex indices [i, j, k]",
+            "items": {
                 "type": "array",
-                "description": "Optional mapping from face index to feature ID",
-                "items": {
-                    "type": ["string", "null"]
-                }
+                "items": {"type": "integer"},
+                "minItems": 3,
+                "maxItems": 3
             }
         },
-        "required": ["vertices", "faces"]
-    }
+        "featureId": {
+            "type": "string",
+            "description": "Optional feature ID for selection mapping"
+        },
+        "faceToFeature": {
+            "type": "array",
+            "description": "Optional mapping from face index to feature ID",
+            "items": {
+                "type": ["string", "null"]
+            }
+        }
+    },
+    "required": ["vertices", "faces"]
+}
+
+
+def create_mesh_schema() -> dict[str, Any]:
+    """Create mesh response schema."""
+    return copy.deepcopy(_MESH_SCHEMA)
 
 
 def save_schema(schema: dict[str, Any], filename: str, output_dir: Path) -> None:
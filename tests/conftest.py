@@ -222,3 +222,46 @@ def sample_part_ir_minimal():
         "sketches": []
     }
 
+
+@pytest.fixture
+def sample_cylinder_part_ir():
+    """Part IR with curved faces, whose mesh size depends on the tolerance."""
+    return {
+        "name": "test_cylinder",
+        "params": {},
+        "features": [
+            {
+                "type": "sketch",
+                "name": "cylinder_sketch",
+                "params": {"plane": "front_plane"},
+                "sketch": {
+                    "name": "cylinder_sketch",
+                    "plane": "front_plane",
+                    "entities": [
+                        {
+                            "id": "circle1",
+                            "type": "circle",
+                            "center": [0.0, 0.0],
+                            "radius": 10.0
+                        }
+                    ],
+                    "constraints": [],
+                    "dimensions": []
+                },
+                "critical": False
+            },
+            {
+                "type": "extrude",
+                "name": "cylinder_extrude",
+                "params": {
+                    "sketch": "cylinder_sketch",
+                    "distance": 20.0,
+                    "operation": "join"
+                },
+                "critical": False
+            }
+        ],
+        "chains": [],
+        "constraints": [],
+        "sketches": []
+    }
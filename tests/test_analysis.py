@@ -22,6 +22,23 @@ async def test_geometry_validation(client, sample_part_ir):
     assert isinstance(data["is_valid_solid"], bool)
 
 
+@pytest.mark.asyncio
+async def test_geometry_validation_malformed_body(client):
+    """Test that malformed or incomplete bodies are request validation errors."""
+    response = await client.post(
+        "/analysis/geometry-validation",
+        content=b'{"part_ir": ',
+        headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 422
+    
+    response = await client.post("/analysis/geometry-validation", json={})
+    assert response.status_code == 422
+    
+    response = await client.post("/analysis/geometry-validation", json={"part_ir": {"name": 1}})
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_mass_properties(client, sample_part_ir):
     """Test mass properties calculation."""
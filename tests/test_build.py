@@ -2,8 +2,15 @@
 Tests for build endpoints (solid, sketch, feature).
 """
 
+import numpy as np
 import pytest
 
+from app.core.builder import build_cad_model, compute_all, tessellation_to_arrays
+from app.core.geometry_utils import (
+    calculate_bounding_box, get_topology_summary, calculate_mass_properties, validate_geometry
+)
+from app.core.ir import PART_ADAPTER
+
 
 @pytest.mark.asyncio
 async def test_build_solid(client, sample_part_ir):
@@ -75,6 +82,224 @@ async def test_build_solid_high_detail(client, sample_part_ir):
     assert data["status"] == "ok"
 
 
+@pytest.mark.asyncio
+async def test_build_solid_multi_detail(client, sample_part_ir):
+    """Test building with coarser LODs derived from one high-detail mesh."""
+    response = await client.post(
+        "/build/solid",
+        json={
+            "part_ir": sample_part_ir,
+            "detail_level": "multi",
+            "return_mesh": True
+        }
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert set(data["lods"]) == {"normal", "coarse"}
+    
+    # Each level is no finer than the one before it
+    triangle_count = len(data["mesh"]["faces"])
+    for level in ("normal", "coarse"):
+        lod = data["lods"][level]
+        assert len(lod["faces"]) <= triangle_count
+        assert all(0 <= i < len(lod["vertices"]) for face in lod["faces"] for i in face)
+        triangle_count = len(lod["faces"])
+
+
+@pytest.mark.asyncio
+async def test_build_solid_after_multi_detail(client, sample_cylinder_part_ir):
+    """Test that a multi-detail build does not leave its fine mesh to later builds."""
+    meshes = {}
+    for detail_level in ("multi", "normal"):
+        response = await client.post(
+            "/build/solid",
+            json={
+                "part_ir": sample_cylinder_part_ir,
+                "detail_level": detail_level,
+                "return_mesh": True
+            }
+        )
+        assert response.status_code == 200
+        meshes[detail_level] = response.json()["mesh"]
+    
+    assert len(meshes["normal"]["faces"]) < len(meshes["multi"]["faces"])
+
+
+@pytest.mark.asyncio
+async def test_build_to_next_pocket(client):
+    """Test that a "to_next" cut stops at the nearest face, not the bounding box."""
+    # 100 x 30 x 10 plate with a 30 x 30 x 80 tower at one end. The pocket's
+    # center is over the plate, so its next face is 10 mm away (bbox extent: 100)
+    part_ir = {
+        "name": "pocketed_plate",
+        "params": {},
+        "features": [
+            {
+                "type": "sketch",
+                "name": "plate_sketch",
+                "params": {"plane": "front_plane"},
+                "sketch": {
+                    "name": "plate_sketch",
+                    "plane": "front_plane",
+                    "entities": [
+                        {
+                            "id": "rect1",
+                            "type": "rectangle",
+                            "corner1": [0.0, 0.0],
+                            "corner2": [100.0, 30.0]
+                        }
+                    ],
+                    "constraints": [],
+                    "dimensions": []
+                },
+                "critical": False
+            },
+            {
+                "type": "extrude",
+                "name": "plate",
+                "params": {"sketch": "plate_sketch", "distance": 10.0, "operation": "join"},
+                "critical": False
+            },
+            {
+                "type": "sketch",
+                "name": "tower_sketch",
+                "params": {"plane": "front_plane"},
+                "sketch": {
+                    "name": "tower_sketch",
+                    "plane": "front_plane",
+                    "entities": [
+                        {
+                            "id": "rect1",
+                            "type": "rectangle",
+                            "corner1": [70.0, 0.0],
+                            "corner2": [100.0, 30.0]
+                        }
+                    ],
+                    "constraints": [],
+                    "dimensions": []
+                },
+                "critical": False
+            },
+            {
+                "type": "extrude",
+                "name": "tower",
+                "params": {"sketch": "tower_sketch", "distance": 80.0, "operation": "join"},
+                "critical": False
+            },
+            {
+                "type": "sketch",
+                "name": "pocket_sketch",
+                "params": {"plane": "front_plane"},
+                "sketch": {
+                    "name": "pocket_sketch",
+                    "plane": "front_plane",
+                    "entities": [
+                        {
+                            "id": "rect1",
+                            "type": "rectangle",
+                            "corner1": [10.0, 5.0],
+                            "corner2": [80.0, 25.0]
+                        }
+                    ],
+                    "constraints": [],
+                    "dimensions": []
+                },
+                "critical": False
+            },
+            {
+                "type": "extrude",
+                "name": "pocket",
+                "params": {"sketch": "pocket_sketch", "distance": "to_next", "operation": "cut"},
+                "critical": False
+            }
+        ],
+        "chains": [],
+        "constraints": [],
+        "sketches": []
+    }
+    response = await client.post("/analysis/mass-properties", json={"part_ir": part_ir})
+    assert response.status_code == 200
+    
+    # 93000 mm³ body minus a 70 x 20 x 10 pocket; the pocket also takes the
+    # bottom 10 mm under the tower, but not the tower above it
+    assert response.json()["volume"] == pytest.approx(79000.0 / 1e9, rel=1e-4)
+
+
+def test_compute_all_matches_single_purpose_helpers(sample_cylinder_part_ir):
+    """Test that compute_all's one-pass metrics match the individual helpers."""
+    part = PART_ADAPTER.validate_python(sample_cylinder_part_ir)
+    result = compute_all(part, tolerance=0.1, density=7850.0)
+    solid = build_cad_model(part).val()
+    
+    assert result["bbox"] == calculate_bounding_box(solid)
+    assert result["topology"] == get_topology_summary(solid)
+    assert (result["is_valid"], result["issues"]) == validate_geometry(solid)
+    
+    expected_mass = calculate_mass_properties(solid, 7850.0)
+    assert set(result["mass"]) == set(expected_mass)
+    for key, value in expected_mass.items():
+        assert np.allclose(result["mass"][key], value), key
+    
+    vertices, faces = tessellation_to_arrays(solid.tessellate(0.1))
+    assert np.array_equal(result["mesh"].faces, faces)
+    assert np.allclose(result["mesh"].vertices, vertices, atol=1e-4)
+
+
+@pytest.mark.asyncio
+async def test_build_solid_etag(client, sample_part_ir):
+    """Test that resending the ETag for an unchanged request returns 304."""
+    request = {"part_ir": sample_part_ir, "detail_level": "normal", "return_mesh": True}
+    response = await client.post("/build/solid", json=request)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    
+    response = await client.post("/build/solid", json=request, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    
+    # A different request gets a new tag and a full response
+    request["detail_level"] = "coarse"
+    response = await client.post("/build/solid", json=request, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_build_solid_etag_equivalent_ir(client, sample_part_ir):
+    """Test that equivalent Part IRs (key order, 50 vs 50.0) share an ETag."""
+    response = await client.post("/build/solid", json={"part_ir": sample_part_ir, "return_mesh": False})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    
+    equivalent_ir = dict(reversed(list(sample_part_ir.items())))
+    equivalent_ir["params"]["width"]["value"] = 50
+    response = await client.post("/build/solid", json={"part_ir": equivalent_ir, "return_mesh": False})
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_build_solid_bbox_independent_of_meshing(client, sample_cylinder_part_ir):
+    """Test that meshing the cached part does not change its bounding box."""
+    request = {"part_ir": sample_cylinder_part_ir, "detail_level": "normal", "return_mesh": False}
+    response = await client.post("/build/solid", json=request)
+    assert response.status_code == 200
+    bounding_box = response.json()["bounding_box"]
+    
+    response = await client.post(
+        "/mesh/solid",
+        json={"part_ir": sample_cylinder_part_ir, "mesh_params": {"linear_tolerance": 0.5}}
+    )
+    assert response.status_code == 200
+    
+    response = await client.post("/build/solid", json=request)
+    assert response.status_code == 200
+    assert response.json()["bounding_box"] == bounding_box
+    assert bounding_box["min"] == pytest.approx([-10.0, -10.0, 0.0])
+    assert bounding_box["max"] == pytest.approx([10.0, 10.0, 20.0])
+
+
 @pytest.mark.asyncio
 async def test_build_solid_no_mesh(client, sample_part_ir):
     """Test building without returning mesh."""
@@ -2,6 +2,7 @@
 Tests for meshing and visualization endpoints.
 """
 
+import numpy as np
 import pytest
 
 
@@ -33,6 +34,50 @@ async def test_mesh_solid(client, sample_part_ir):
     assert "linear_tolerance" in data["metrics"]
 
 
+@pytest.mark.asyncio
+async def test_mesh_solid_weld(client, sample_part_ir):
+    """Test that welding merges vertices shared between faces."""
+    meshes = {}
+    for weld in (False, True):
+        response = await client.post(
+            "/mesh/solid",
+            json={
+                "part_ir": sample_part_ir,
+                "mesh_params": {"linear_tolerance": 0.1, "weld": weld}
+            }
+        )
+        assert response.status_code == 200
+        meshes[weld] = response.json()["mesh"]
+    
+    # Same triangles, fewer vertices, all indices in range
+    assert len(meshes[True]["faces"]) == len(meshes[False]["faces"])
+    assert len(meshes[True]["vertices"]) < len(meshes[False]["vertices"])
+    vertex_count = len(meshes[True]["vertices"])
+    assert all(0 <= i < vertex_count for face in meshes[True]["faces"] for i in face)
+
+
+@pytest.mark.asyncio
+async def test_mesh_solid_tolerance_independent_of_history(client, sample_cylinder_part_ir):
+    """Test that a cached part is remeshed at each requested tolerance."""
+    # A fine STL export first leaves a 1e-3 triangulation on the cached solid
+    response = await client.post("/export/stl", json={"part_ir": sample_cylinder_part_ir})
+    assert response.status_code == 200
+    
+    triangle_counts = {}
+    for tolerance in (0.01, 0.5):
+        response = await client.post(
+            "/mesh/solid",
+            json={
+                "part_ir": sample_cylinder_part_ir,
+                "mesh_params": {"linear_tolerance": tolerance}
+            }
+        )
+        assert response.status_code == 200
+        triangle_counts[tolerance] = response.json()["metrics"]["triangle_count"]
+    
+    assert triangle_counts[0.5] < triangle_counts[0.01]
+
+
 @pytest.mark.asyncio
 async def test_section_plane(client, sample_part_ir):
     """Test computing a 2D section at a plane."""
@@ -50,4 +95,53 @@ async def test_section_plane(client, sample_part_ir):
     data = response.json()
     assert "curves" in data
     assert isinstance(data["curves"], list)
+    for curve in data["curves"]:
+        assert len(curve["points"]) >= 2
+        assert all(len(point) == 2 for point in curve["points"])
+
 
+
+@pytest.mark.asyncio
+async def test_mesh_solid_binary(client, sample_part_ir):
+    """Test that the binary mesh matches the JSON mesh."""
+    request = {"part_ir": sample_part_ir, "mesh_params": {"linear_tolerance": 0.1}}
+    json_mesh = (await client.post("/mesh/solid", json=request)).json()["mesh"]
+    response = await client.post("/mesh/solid/binary", json=request)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    
+    vertex_count = int(response.headers["x-vertex-count"])
+    triangle_count = int(response.headers["x-triangle-count"])
+    assert vertex_count == len(json_mesh["vertices"])
+    assert triangle_count == len(json_mesh["faces"])
+    
+    vertices = np.frombuffer(response.content, dtype="<f4", count=vertex_count * 3)
+    faces = np.frombuffer(response.content, dtype="<u4", offset=vertex_count * 12)
+    assert len(faces) == triangle_count * 3
+    assert np.allclose(vertices.reshape(-1, 3), json_mesh["vertices"], atol=1e-3)
+    assert faces.reshape(-1, 3).tolist() == json_mesh["faces"]
+
+
+@pytest.mark.asyncio
+async def test_mesh_solid_binary_quantized(client, sample_part_ir):
+    """Test that quantized positions decode to within one step of the float mesh."""
+    request = {"part_ir": sample_part_ir, "mesh_params": {"linear_tolerance": 0.1}}
+    full = await client.post("/mesh/solid/binary", json=request)
+    request["mesh_params"]["quantize"] = True
+    response = await client.post("/mesh/solid/binary", json=request)
+    assert response.status_code == 200
+    
+    vertex_count = int(response.headers["x-vertex-count"])
+    offset = np.array(response.headers["x-vertex-offset"].split(","), dtype=np.float64)
+    scale = np.array(response.headers["x-vertex-scale"].split(","), dtype=np.float64)
+    quantized = np.frombuffer(response.content, dtype="<u2", count=vertex_count * 3)
+    decoded = quantized.reshape(-1, 3) * scale + offset
+    
+    expected = np.frombuffer(full.content, dtype="<f4", count=vertex_count * 3).reshape(-1, 3)
+    assert np.all(np.abs(decoded - expected) <= scale + 1e-3)
+    
+    faces_offset = (vertex_count * 6 + 3) // 4 * 4
+    assert np.array_equal(
+        np.frombuffer(response.content, dtype="<u4", offset=faces_offset),
+        np.frombuffer(full.content, dtype="<u4", offset=vertex_count * 12)
+    )
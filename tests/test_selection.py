@@ -27,6 +27,47 @@ async def test_map_pick(client, sample_part_ir):
     assert "feature_reference" in data or data.get("feature_reference") is None
 
 
+@pytest.mark.asyncio
+async def test_map_pick_hit(client, sample_part_ir):
+    """Test that rays pick the nearest face of the 50 x 30 x 80 box."""
+    async def pick(origin, direction):
+        response = await client.post(
+            "/selection/map-pick",
+            json={
+                "part_ir": sample_part_ir,
+                "pick_ray": {"origin": origin, "direction": direction}
+            }
+        )
+        assert response.status_code == 200
+        return response.json()["face_id"]
+    
+    top = await pick([25.0, 15.0, 100.0], [0.0, 0.0, -1.0])
+    bottom = await pick([25.0, 15.0, -20.0], [0.0, 0.0, 1.0])
+    assert top is not None and top.startswith("face_")
+    assert bottom is not None and bottom.startswith("face_")
+    assert top != bottom
+    
+    # From inside the body, the downward ray hits the bottom face (z = 0), not the top
+    assert await pick([25.0, 15.0, 40.0], [0.0, 0.0, -1.0]) == bottom
+
+
+@pytest.mark.asyncio
+async def test_map_pick_miss(client, sample_part_ir):
+    """Test that a ray pointing away from the part picks nothing."""
+    response = await client.post(
+        "/selection/map-pick",
+        json={
+            "part_ir": sample_part_ir,
+            "pick_ray": {
+                "origin": [1000.0, 1000.0, 1000.0],
+                "direction": [1.0, 0.0, 0.0]
+            }
+        }
+    )
+    assert response.status_code == 200
+    assert response.json()["face_id"] is None
+
+
 @pytest.mark.asyncio
 async def test_topology_tagging(client):
     """Test topology tagging for stable IDs."""
@@ -54,3 +95,21 @@ async def test_topology_tagging(client):
     assert isinstance(data["edge_mapping"], dict)
     assert isinstance(data["vertex_mapping"], dict)
 
+
+@pytest.mark.asyncio
+async def test_topology_tagging_unchanged(client):
+    """Test that an unchanged signature maps every ID to itself."""
+    signature = {
+        "faces": ["f0", "f1", "f2"],
+        "edges": [{"id": "e0"}, {"id": "e1"}],
+        "vertices": {"v0": {}, "v1": {}}
+    }
+    response = await client.post(
+        "/topology/tagging",
+        json={"old_solid_signature": signature, "new_solid_signature": signature}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["face_mapping"] == {"f0": "f0", "f1": "f1", "f2": "f2"}
+    assert data["edge_mapping"] == {"e0": "e0", "e1": "e1"}
+    assert data["vertex_mapping"] == {"v0": "v0", "v1": "v1"}